@@ -18,9 +18,65 @@ try:
 except ImportError:
     print("ImportError: audio_player.py are not found")
 
+try:
+    from .recording_recovery import recover_recordings
+except ImportError:
+    print("ImportError: recording_recovery.py are not found")
+
+try:
+    from .ring_buffer import RingBuffer
+except ImportError:
+    print("ImportError: ring_buffer.py are not found")
+
+try:
+    from .wav_markers import write_cue_chunk, save_marker_sidecar, load_marker_sidecar
+except ImportError:
+    print("ImportError: wav_markers.py are not found")
+
+try:
+    from .level_meter import LevelMeter
+except ImportError:
+    print("ImportError: level_meter.py are not found")
+
+try:
+    from .backend import AudioBackend, SoundDeviceBackend, SimulatedBackend, get_backend, set_backend
+except ImportError:
+    print("ImportError: backend.py are not found")
+
+try:
+    from .stimulus_cache import StimulusCache
+except ImportError:
+    print("ImportError: stimulus_cache.py are not found")
+
+try:
+    from .stimulus_resampler import ResampleCache, prepare_stimuli
+except ImportError:
+    print("ImportError: stimulus_resampler.py are not found")
+
+try:
+    from .device_registry import DeviceRegistry, get_registry
+except ImportError:
+    print("ImportError: device_registry.py are not found")
+
 __all__ = [
     'AudioConstants',
     'AudioDeviceWindow',
     'AudioRecorder',
-    'AudioPlayer'
+    'AudioPlayer',
+    'recover_recordings',
+    'RingBuffer',
+    'write_cue_chunk',
+    'save_marker_sidecar',
+    'load_marker_sidecar',
+    'LevelMeter',
+    'AudioBackend',
+    'SoundDeviceBackend',
+    'SimulatedBackend',
+    'get_backend',
+    'set_backend',
+    'StimulusCache',
+    'ResampleCache',
+    'prepare_stimuli',
+    'DeviceRegistry',
+    'get_registry'
 ]
\ No newline at end of file
@@ -1,3 +1,36 @@
 class AudioConstants:
     SAMPLE_RATE = 44100
-    CHANNELS = 1
\ No newline at end of file
+    CHANNELS = 1
+    # 스트림 지연 설정 기본값 (config.json의 audio 항목으로 덮어씀)
+    # blocksize: 콜백 블록 크기 (0이면 장치 기본값), latency: 'low'/'high' 또는 초,
+    # dtype: 'float32' 또는 'int16'
+    # 기본값은 호스트 기본 설정(blocksize 0, 'high')으로 두어 검증되지 않은 장비에서 xrun 위험을 늘리지 않음
+    LATENCY_PROFILE = {
+        'blocksize': 0,
+        'latency': 'high',
+        'dtype': 'float32'
+    }
+    # config['audio']['profile']로 고르는 이름 있는 설정 (해당 장비에서 xrun 없이 검증된 경우에만 'low' 사용)
+    LATENCY_PROFILES = {
+        'default': {},
+        'low': {'blocksize': 256, 'latency': 'low'},
+    }
+
+    @staticmethod
+    def latency_profile(overrides=None):
+        """
+        기본 지연 설정에 overrides(config['audio'])를 덮어쓴 설정을 반환합니다.
+
+        overrides의 'profile'로 LATENCY_PROFILES의 설정을 먼저 적용하고, blocksize/latency/dtype를
+        직접 지정했다면 그 값을 마지막으로 적용합니다.
+        """
+        profile = dict(AudioConstants.LATENCY_PROFILE)
+        overrides = overrides or {}
+        name = overrides.get('profile') or 'default'
+        if name not in AudioConstants.LATENCY_PROFILES:
+            print(f"알 수 없는 지연 프로필 '{name}' - 기본 설정을 사용합니다.")
+            name = 'default'
+        profile.update(AudioConstants.LATENCY_PROFILES[name])
+        profile.update({key: value for key, value in overrides.items() if key in profile})
+        profile['profile'] = name
+        return profile
\ No newline at end of file
@@ -1,12 +1,13 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 import tkinter.ttk as ttk
-import sounddevice as sd
 import numpy as np
 import soundfile as sf
 import os
 import sys
 from audio import AudioConstants
+from audio.backend import get_backend
+from audio.device_registry import get_registry
 
 
 class AudioDeviceWindow:
@@ -30,9 +31,10 @@ class AudioDeviceWindow:
             wraplength=500
         ).pack(pady=20)
         
-        # 장치 목록 가져오기
-        devices = sd.query_devices()
-        input_devices = [d for d in devices if d['max_input_channels'] > 0]
+        # 장치 목록 가져오기 (세션 동안 이 snapshot을 재사용)
+        self.backend = get_backend()
+        registry = get_registry().snapshot()
+        input_devices = registry.input_devices()
         
         # 장치 선택 콤보박스
         self.device_var = tk.StringVar()
@@ -44,14 +46,12 @@ class AudioDeviceWindow:
         
         # 콤보박스에 장치 목록 설정
         self.device_list = [f"{d['name']} (입력 채널: {d['max_input_channels']})" for d in input_devices]
-        self.device_indices = [devices.index(d) for d in input_devices]
+        self.device_indices = [d['index'] for d in input_devices]
         self.device_combo['values'] = self.device_list
         
         # 기본 장치 선택
-        default_device = sd.query_devices(kind='input')
-        default_index = devices.index(default_device)
         try:
-            default_list_index = self.device_indices.index(default_index)
+            default_list_index = self.device_indices.index(registry.default_input)
             self.device_combo.current(default_list_index)
         except ValueError:
             if self.device_list:
@@ -90,13 +90,13 @@ class AudioDeviceWindow:
                                                 "3. 녹음이 끝나면 자동으로 재생됩니다.")
                 
                 # 3초 녹음
-                recording = sd.rec(
+                recording = self.backend.rec(
                     int(3 * AudioConstants.SAMPLE_RATE),
                     samplerate=AudioConstants.SAMPLE_RATE,
                     channels=AudioConstants.CHANNELS,
                     device=device_index
                 )
-                sd.wait()
+                self.backend.wait()
                 
                 # 녹음된 데이터가 2차원 배열인 경우 1차원으로 변환
                 if len(recording.shape) > 1:
@@ -121,8 +121,8 @@ class AudioDeviceWindow:
                                                 "1. 소리가 잘 들리는지 확인해주세요.\n"
                                                 "2. 소리가 너무 작거나 들리지 않는다면 '취소'를 눌러 다른 마이크를 선택해주세요.")
                 data, samplerate = sf.read(temp_file)
-                sd.play(data, samplerate)
-                sd.wait()
+                self.backend.play(data, samplerate)
+                self.backend.wait()
                 
                 # 임시 파일 삭제
                 if os.path.exists(temp_file):
@@ -1,55 +1,228 @@
-import sounddevice as sd
+import os
+import time
+import threading
+from collections import deque
 import soundfile as sf
+from audio import AudioConstants
+from audio.backend import get_backend
+
+class Stimulus:
+    """재생 대기열의 자극 하나. 재생이 끝나면 DAC 기준 시작/종료 시각이 채워집니다."""
+
+    def __init__(self, name, data, samplerate, start_at=None):
+        self.name = name
+        self.data = data
+        self.samplerate = samplerate
+        self.start_at = start_at    # 재생할 스트림 시각 (None이면 앞 자극 바로 다음)
+        self.position = 0
+        self.queued_at = None       # 대기열에 넣은 스트림 시각
+        self.queued_clock = None    # 대기열에 넣은 time.perf_counter() 시각
+        self.generation = 0         # 대기열에 넣을 때의 AudioPlayer.generation (stop()마다 증가)
+        self.dac_onset = None       # 첫 샘플이 DAC에 도달한 스트림 시각
+        self.dac_offset = None      # 마지막 샘플 다음 시각
+        self.done = threading.Event()
+
+    @property
+    def duration(self):
+        return len(self.data) / self.samplerate
+
+    @property
+    def onset_latency(self):
+        """대기열에 넣은 시각부터 실제 DAC 시작까지 걸린 시간 (초)"""
+        if self.dac_onset is None or self.queued_at is None:
+            return None
+        return self.dac_onset - self.queued_at
 
 class AudioPlayer:
-    def __init__(self, folder_path):
+    def __init__(self, folder_path, latency_profile=None, backend=None, cache=None):
+        """
+        단계 동안 출력 스트림 하나를 열어 두고 자극을 대기열로 재생합니다.
+
+        Args:
+            folder_path (str): 참가자 폴더 경로
+            latency_profile (dict, optional): blocksize/latency/dtype (config['audio'])
+            backend (AudioBackend, optional): 오디오 백엔드. None이면 get_backend()
+            cache (StimulusCache, optional): 있으면 미리 디코딩한 배열로 재생
+        """
+        self.backend = backend or get_backend()
+        self.cache = cache
         self.folder_path = folder_path
-        self.playing = False
         self.stream = None
-        self.data = None
         self.samplerate = None
-        self.current_frame = 0
-        
+        # 스트림 지연 설정 (config['audio'])과 실제로 협상된 값
+        self.latency_profile = AudioConstants.latency_profile(latency_profile)
+        self.stream_info = None
+
+        # 콜백과 UI 스레드가 공유하는 대기열 (deque의 append/popleft는 원자적)
+        self.pending = deque()
+        # current/scheduled는 콜백만 바꿈. stop()은 generation만 올리고, 이전 세대의
+        # 자극은 콜백이 버림 (UI 스레드와 콜백이 같은 상태를 동시에 고치지 않도록)
+        self.current = None
+        self.scheduled = None      # 대기열에서 꺼냈지만 예약 시각이 아직 오지 않은 자극
+        self.generation = 0
+        self.last_stimulus = None
+        self.onset_log = []        # 재생이 끝난 자극의 DAC 시작/종료 시각
+        self.output_underflows = 0
+
+    def open_stream(self, samplerate=None):
+        """출력 스트림을 열고 시작합니다. (이미 같은 샘플링 레이트로 열려 있으면 그대로 사용)"""
+        samplerate = samplerate or AudioConstants.SAMPLE_RATE
+        if self.stream is not None:
+            if self.samplerate == samplerate:
+                return self.stream
+            self.close()
+
+        self.samplerate = samplerate
+        self.stream = self.backend.output_stream(
+            channels=1,
+            samplerate=samplerate,
+            blocksize=self.latency_profile['blocksize'],
+            latency=self.latency_profile['latency'],
+            dtype=self.latency_profile['dtype'],
+            callback=self._callback
+        )
+        self.stream.start()
+        self.stream_info = {
+            'latency': self.stream.latency,
+            'blocksize': self.stream.blocksize,
+            'samplerate': self.stream.samplerate,
+            'dtype': self.stream.dtype,
+        }
+        return self.stream
+
+    def _callback(self, outdata, frames, time, status):
+        """
+        출력 콜백: 대기열의 자극을 이어서 내보내고 나머지는 무음으로 채웁니다.
+
+        자극의 첫 샘플이 들어간 블록 내 위치로 DAC 시작 시각을 계산합니다.
+        """
+        if status and status.output_underflow:
+            self.output_underflows += 1
+        outdata.fill(0)
+        block_dac = time.outputBufferDacTime
+        pos = 0
+        while pos < frames:
+            item = self.current
+            if item is not None and item.generation != self.generation:
+                # stop()으로 중단된 자극
+                item.done.set()
+                item = self.current = None
+            if item is None:
+                item = self.scheduled
+                if item is None:
+                    # 확인과 꺼내기 사이에 stop()이 대기열을 비울 수 있으므로 한 번에 꺼냄
+                    try:
+                        item = self.pending.popleft()
+                    except IndexError:
+                        break
+                self.scheduled = None
+                if item.generation != self.generation:
+                    item.done.set()
+                    continue
+                if item.start_at is not None:
+                    # 예약된 시각이 이 블록 뒤라면 다음 블록에서 시작
+                    offset = int(round((item.start_at - block_dac) * self.samplerate))
+                    if offset >= frames:
+                        self.scheduled = item
+                        break
+                    pos = max(pos, offset)
+                self.current = item
+                item.dac_onset = block_dac + pos / self.samplerate
+
+            n = min(frames - pos, len(item.data) - item.position)
+            outdata[pos:pos + n, 0] = item.data[item.position:item.position + n]
+            item.position += n
+            pos += n
+            if item.position >= len(item.data):
+                item.dac_offset = block_dac + pos / self.samplerate
+                self.current = None
+                self.onset_log.append({
+                    '음성파일': item.name,
+                    'DAC시작': item.dac_onset,
+                    'DAC종료': item.dac_offset,
+                    '대기시작': item.queued_at,
+                })
+                item.done.set()
+
+    def _load(self, audio_file):
+        if self.cache is not None:
+            return self.cache.get(audio_file)
+        data, samplerate = sf.read(audio_file, dtype=self.latency_profile['dtype'], always_2d=True)
+        return data.mean(axis=1).astype(data.dtype) if data.shape[1] > 1 else data[:, 0], samplerate
+
+    def queue_stimulus(self, audio_file, start_at=None):
+        """
+        자극을 대기열에 넣습니다. 앞 자극이 끝나는 샘플 바로 다음에 이어서 재생됩니다.
+
+        Args:
+            audio_file (str): 자극 파일 경로
+            start_at (float, optional): 재생 시작 스트림 시각 (stream.time 기준)
+
+        Returns:
+            Stimulus: 완료 이벤트(done)와 DAC 시작/종료 시각을 담는 객체
+        """
+        data, samplerate = self._load(audio_file)
+        self.open_stream(samplerate)
+        item = Stimulus(os.path.basename(audio_file), data, samplerate, start_at)
+        item.queued_at = self.stream.time
+        item.queued_clock = time.perf_counter()
+        item.generation = self.generation
+        self.pending.append(item)
+        self.last_stimulus = item
+        return item
+
     def play_audio(self, audio_file):
-        if self.playing:
+        """자극을 바로 재생합니다. (재생 중이면 무시하고 0 반환)"""
+        if self.is_playing():
             return 0
-            
         try:
-            self.data, self.samplerate = sf.read(audio_file)
-            duration = len(self.data) / self.samplerate
-            self.current_frame = 0
-            
-            def callback(outdata, frames, time, status):
-                if status:
-                    print(f'Error: {status}')
-                if self.current_frame + frames > len(self.data):
-                    # 남은 데이터가 프레임보다 적을 경우
-                    remaining = len(self.data) - self.current_frame
-                    outdata[:remaining, 0] = self.data[self.current_frame:len(self.data)]
-                    outdata[remaining:, 0] = 0
-                    self.playing = False
-                    raise sd.CallbackStop()
-                else:
-                    outdata[:, 0] = self.data[self.current_frame:self.current_frame + frames]
-                    self.current_frame += frames
-            
-            self.stream = sd.OutputStream(
-                channels=1,
-                samplerate=self.samplerate,
-                callback=callback
-            )
-            self.stream.start()
-            self.playing = True
-            return duration
+            return self.queue_stimulus(audio_file).duration
         except Exception as e:
             print(f"오디오 재생 오류: {str(e)}")
             return 0
-            
+
     def is_playing(self):
-        return self.playing
+        """대기 중이거나 재생 중인 자극이 있으면 True (마지막 샘플이 DAC에 도달할 때까지)"""
+        if self.pending or any(item is not None and item.generation == self.generation
+                               for item in (self.current, self.scheduled)):
+            return True
+        last = self.last_stimulus
+        if last is None or last.dac_offset is None or self.stream is None:
+            return False
+        return self.stream.time < last.dac_offset
+
+    def has_finished(self, item):
+        """자극의 마지막 샘플이 DAC에 도달했으면 True (UI 스레드에서 after()로 확인)"""
+        if item is None or not item.done.is_set():
+            return item is None
+        if item.dac_offset is None or self.stream is None:
+            return True  # stop()으로 중단됨
+        return self.stream.time >= item.dac_offset
 
     def stop(self):
-        self.playing = False
+        """
+        대기열을 비우고 재생 중인 자극을 멈춥니다. (스트림은 열어 둠)
+
+        재생 중인 자극은 콜백이 다음 블록에서 버리므로, 콜백 도중에 불러도 안전합니다.
+        """
+        self.generation += 1
+        # 콜백도 popleft로 꺼내므로, 비울 때도 하나씩 꺼내 완료 이벤트를 세움
+        while True:
+            try:
+                self.pending.popleft().done.set()
+            except IndexError:
+                break
+        for item in (self.current, self.scheduled):
+            if item is not None:
+                item.done.set()
+        self.last_stimulus = None
+
+    def close(self):
+        """단계가 끝나면 출력 스트림을 닫습니다."""
+        self.stop()
         if self.stream:
             self.stream.stop()
+            self.stream.close()
             self.stream = None
+        self.current = None
+        self.scheduled = None
@@ -1,68 +1,358 @@
-import sounddevice as sd
 import numpy as np
 import soundfile as sf
-import os   
+import os
 import sys
+import time
+import threading
 from audio import AudioConstants
+from audio.backend import get_backend
+from audio.recording_recovery import PARTIAL_SUFFIX
+from audio.ring_buffer import RingBuffer
+from audio.wav_markers import write_cue_chunk, save_marker_sidecar
+from audio.level_meter import LevelMeter
 from datetime import datetime
 
+# libsndfile sf_command: 지금까지 기록한 길이로 WAV 헤더를 갱신
+SFC_UPDATE_HEADER_NOW = 0x1060
+
 class AudioRecorder:
-    def __init__(self, device_index, folder_path=None):
+    def __init__(self, device_index, folder_path=None, streaming=True, header_interval=2.0,
+                 buffer_seconds=10.0, latency_profile=None, backend=None):
+        """
+        Args:
+            device_index (int): 입력 장치 번호
+            folder_path (str, optional): 녹음 파일을 저장할 참가자 폴더
+            streaming (bool): True이면 콜백 블록을 작성 스레드가 바로 파일에 기록하고,
+                False이면 기존처럼 메모리에 모았다가 녹음 종료 시 한 번에 저장
+            header_interval (float): 스트리밍 모드에서 헤더 갱신과 디스크 동기화 간격 (초)
+            buffer_seconds (float): 스트리밍 모드 링 버퍼 길이 (초)
+            latency_profile (dict, optional): blocksize/latency/dtype (config['audio'])
+            backend (AudioBackend, optional): 오디오 백엔드. None이면 get_backend()
+        """
+        self.backend = backend or get_backend()
         self.device_index = device_index
         self.folder_path = folder_path
+        self.streaming = streaming
+        self.header_interval = header_interval
         self.recording = False
         self.stream = None
         self.frames = []
-        
+
+        # 스트림 지연 설정과 실제로 협상된 값 (stream_info)
+        self.latency_profile = AudioConstants.latency_profile(latency_profile)
+        self.stream_info = None
+
+        # 스트리밍 모드: 콜백 -> 링 버퍼 -> 작성 스레드 -> SoundFile
+        self.ring_buffer = RingBuffer(buffer_seconds, AudioConstants.SAMPLE_RATE, AudioConstants.CHANNELS,
+                                      dtype=self.latency_profile['dtype'])
+        self.writer_thread = None
+        self.writer_running = False
+        self.sound_file = None
+        self.write_error = None
+        self.header_sync = True  # WAV 헤더 갱신 사용 여부 (실패하면 녹음 동안 끔)
+
+        # 콜백 상태 통계 (출력하지 않고 get_overflow_counts로 조회)
+        self.input_overflows = 0
+        self.status_errors = 0
+        self.last_status = None
+
+        # 마커 트랙: 녹음 파일 기준 샘플 위치
+        self.frames_captured = 0
+        self.clock_reference = None  # (블록 첫 샘플 위치, 블록 ADC 시각)
+        self.markers = []
+        self.deferred_markers = []   # 첫 콜백 전에 찍혀 아직 위치를 모르는 마커 (입력 스트림 시각)
+
+        # 입력 레벨 측정 (UI에서 after()로 level_meter.current()를 읽음)
+        self.level_meter = LevelMeter()
+
     def start_recording(self, filename):
         if self.recording:
             return
-            
+
         self.frames = []
         # 현재 시간 정보를 포함한 파일 이름 생성
         current_time = datetime.now()
         time_str = current_time.strftime('%Y%m%d_%H%M')
-        
+
         # 참가자 ID와 단계 정보 추출
         participant_id = filename.split('_')[0]
         stage = filename.split('stage')[1]
-        
+
         # 새로운 파일 이름 생성
         new_filename = f"{participant_id}_stage{stage}_{time_str}"
-        
+
         # 참가자 폴더 경로에 파일 저장
         if self.folder_path:
             self.filename = os.path.join(self.folder_path, new_filename + '.wav')
         else:
             self.filename = new_filename + '.wav'
-            
+
+        if self.streaming:
+            self._start_writer()
+
         self.recording = True
-        
+
+        self.input_overflows = 0
+        self.status_errors = 0
+        self.last_status = None
+        self.frames_captured = 0
+        self.clock_reference = None
+        self.markers = []
+        self.deferred_markers = []
+        self.level_meter.reset()
+
         def callback(indata, frames, time, status):
+            # 블록 첫 샘플의 위치와 ADC 시각을 한 번에 기록 (add_marker에서 사용)
+            self.clock_reference = (self.frames_captured, time.inputBufferAdcTime or time.currentTime)
+            self.frames_captured += frames
             if status:
-                print(f'Error: {status}')
+                self.status_errors += 1
+                self.last_status = status
+                if status.input_overflow:
+                    self.input_overflows += 1
             if self.recording:
-                self.frames.append(indata.copy())
-        
-        self.stream = sd.InputStream(
+                self.level_meter.process(indata)
+                if self.streaming:
+                    # 미리 할당한 버퍼에 슬라이스 복사만 하므로 콜백에서 새 배열을 만들지 않음
+                    self.ring_buffer.write(indata)
+                else:
+                    self.frames.append(indata.copy())
+
+        self.stream = self.backend.input_stream(
             device=self.device_index,
             channels=1,
             samplerate=AudioConstants.SAMPLE_RATE,
+            blocksize=self.latency_profile['blocksize'],
+            latency=self.latency_profile['latency'],
+            dtype=self.latency_profile['dtype'],
             callback=callback
         )
         self.stream.start()
-        
+        # 장치와 협상된 실제 값 기록 (Info 시트에 저장)
+        self.stream_info = {
+            'latency': self.stream.latency,
+            'blocksize': self.stream.blocksize,
+            'samplerate': self.stream.samplerate,
+            'dtype': self.stream.dtype,
+        }
+
+    def _start_writer(self):
+        """
+        녹음 파일을 열고 큐의 블록을 파일에 이어 쓰는 작성 스레드를 시작합니다.
+
+        녹음 중에는 {파일명}.partial.wav에 기록하고 정상 종료 시 원래 이름으로 바꿉니다.
+        프로그램이 비정상 종료되면 .partial.wav가 남으며 recording_recovery로 복구할 수 있습니다.
+        """
+        self.partial_filename = self.filename[:-len('.wav')] + PARTIAL_SUFFIX
+        self.sound_file = sf.SoundFile(
+            self.partial_filename,
+            mode='w',
+            samplerate=AudioConstants.SAMPLE_RATE,
+            channels=AudioConstants.CHANNELS,
+            subtype='PCM_16'
+        )
+        self.ring_buffer.reset()
+        self.write_error = None
+        self.header_sync = True
+        self.writer_running = True
+        self.writer_thread = threading.Thread(target=self._write_blocks, daemon=True)
+        self.writer_thread.start()
+
+    def _sync_file(self):
+        """WAV 헤더를 현재 길이로 갱신하고 디스크에 동기화합니다."""
+        if self.header_sync:
+            try:
+                sf._snd.sf_command(self.sound_file._file, SFC_UPDATE_HEADER_NOW, sf._ffi.NULL, 0)
+            except Exception as e:
+                # soundfile 내부 API를 쓰므로 어떤 오류든 한 번만 알리고 이후 갱신은 끔
+                # (헤더는 복구 도구로 고칠 수 있으므로 동기화만 계속 수행)
+                self.header_sync = False
+                print(f"WAV 헤더 갱신을 중단합니다: {str(e)}")
+        self.sound_file.flush()
+
+    def _write_blocks(self, poll_interval=0.02):
+        """작성 스레드: 녹음이 끝나고 버퍼가 빌 때까지 링 버퍼의 프레임을 파일에 기록합니다."""
+        sync_frames = int(self.header_interval * AudioConstants.SAMPLE_RATE)
+        unsynced = 0
+        while True:
+            running = self.writer_running
+            block = self.ring_buffer.read()
+            if len(block) == 0:
+                if not running:
+                    break
+                time.sleep(poll_interval)
+                continue
+            try:
+                self.sound_file.write(block)
+                unsynced += len(block)
+                if unsynced >= sync_frames:
+                    self._sync_file()
+                    unsynced = 0
+            except Exception as e:
+                # 오류가 나도 버퍼는 계속 비워서 콜백이 막히지 않도록 함
+                if self.write_error is None:
+                    self.write_error = e
+                    print(f"녹음 파일 기록 오류: {str(e)}")
+
     def stop_recording(self):
         if not self.recording:
             return
-            
+
+        # 녹음 중일 때만 시각을 샘플로 바꿀 수 있으므로 멈추기 전에 미뤄 둔 마커를 정리
+        self._resolve_deferred_markers()
+        if self.deferred_markers:
+            print(f"콜백이 한 번도 실행되지 않아 마커 {len(self.deferred_markers)}개를 버립니다.")
+            self.deferred_markers = []
         self.recording = False
         if self.stream:
             self.stream.stop()
             self.stream.close()
             self.stream = None
-            
+
+        if self.streaming:
+            # 남은 프레임을 기록한 뒤 파일을 닫기만 하면 됨
+            self.writer_running = False
+            try:
+                self.writer_thread.join()
+            finally:
+                self.writer_thread = None
+                try:
+                    self.sound_file.close()
+                finally:
+                    self.sound_file = None
+
+            if self.write_error is not None:
+                # 기록 오류가 있었던 파일은 .partial.wav로 남겨 recording_recovery가 복구하도록 함
+                # (cue 청크를 덧붙이면 복구 시 샘플로 읽히므로 마커는 .markers.npz에만 저장)
+                print(f"녹음 파일에 기록 오류가 있어 {os.path.basename(self.partial_filename)}로 남겨 둡니다.")
+                self._write_markers(cue=False)
+                return
+            os.replace(self.partial_filename, self.filename)
+            self._write_markers()
+            return
+
         if self.frames:
             data = np.concatenate(self.frames, axis=0)
             sf.write(self.filename, data, AudioConstants.SAMPLE_RATE)
             self.frames = []
+            self._write_markers()
+
+    def time_to_sample(self, stream_time):
+        """
+        입력 스트림 시각을 녹음 파일의 샘플 위치로 바꿉니다.
+
+        마지막 콜백 블록의 첫 샘플 위치와 ADC 시각을 기준으로 계산합니다. 다른 스트림
+        (재생 스트림의 DAC 시각 등)의 시각은 measure_clock_offset으로 잰 오프셋을 더해
+        입력 스트림 시각으로 바꾼 뒤 넣어야 합니다.
+
+        Returns:
+            int: 샘플 위치. 녹음 중이 아니거나 아직 콜백이 실행되지 않아 기준 시각이 없으면 None
+        """
+        if not self.recording or self.stream is None:
+            return None
+        reference = self.clock_reference
+        if reference is None:
+            return None
+        block_start, adc_time = reference
+        return max(block_start + int(round((stream_time - adc_time) * AudioConstants.SAMPLE_RATE)), 0)
+
+    def measure_clock_offset(self, other_stream, repeats=5):
+        """
+        다른 스트림의 시각을 입력 스트림 시각으로 바꾸는 오프셋을 잽니다.
+
+        PortAudio는 스트림 시계의 기준점을 정하지 않으므로 두 스트림 시각을 연달아 읽어
+        차이를 구합니다. 입력 시계를 앞뒤로 읽어 그 사이가 가장 짧았던 측정을 씁니다.
+
+        Args:
+            other_stream: 시각(time)을 가진 스트림 (예: AudioPlayer.stream)
+            repeats (int): 측정 횟수
+
+        Returns:
+            float: 입력 스트림 시각 - 다른 스트림 시각 (초). 녹음 중이 아니면 None
+        """
+        if not self.recording or self.stream is None or other_stream is None:
+            return None
+        best = None
+        for _ in range(repeats):
+            before = self.stream.time
+            other = other_stream.time
+            after = self.stream.time
+            if best is None or after - before < best[0]:
+                best = (after - before, (before + after) / 2 - other)
+        return best[1]
+
+    def stream_time(self):
+        """입력 스트림 시계의 현재 시각 (초). 녹음 중이 아니면 None"""
+        if not self.recording or self.stream is None:
+            return None
+        return self.stream.time
+
+    def add_marker(self, kind, trial, label='', at_time=None):
+        """
+        현재 시각(또는 at_time)에 해당하는 녹음 샘플 위치를 마커로 기록합니다.
+
+        Args:
+            kind (str): 마커 종류 ('onset', 'stimulus_end', 'space')
+            trial (int): 시행 번호 (1부터)
+            label (str): 단어 또는 음성 파일 이름
+            at_time (float, optional): 입력 스트림 시각. None이면 현재 시각
+
+        Returns:
+            int: 샘플 위치. 녹음 중이 아니거나, 첫 콜백 전이라 위치 계산을 미룬 경우 None
+                (미룬 마커는 기준 시각이 생긴 뒤 다음 add_marker 또는 녹음 종료 때 기록됨)
+        """
+        if not self.recording or self.stream is None:
+            return None
+        stream_time = self.stream.time if at_time is None else at_time
+        sample = self.time_to_sample(stream_time)
+        if sample is None:
+            self.deferred_markers.append((stream_time, kind, trial, label))
+            return None
+        self._resolve_deferred_markers()
+        self.markers.append((sample, kind, trial, label))
+        return sample
+
+    def _resolve_deferred_markers(self):
+        """첫 콜백 전에 미뤄 둔 마커의 샘플 위치를 계산해 마커 목록에 넣습니다."""
+        if not self.deferred_markers or self.time_to_sample(0.0) is None:
+            return
+        for stream_time, kind, trial, label in self.deferred_markers:
+            self.markers.append((self.time_to_sample(stream_time), kind, trial, label))
+        self.deferred_markers = []
+
+    def _write_markers(self, cue=True):
+        """
+        녹음 파일에 cue 청크를 덧붙이고 .markers.npz 파일을 저장합니다.
+
+        Args:
+            cue (bool): False이면 .markers.npz만 저장 (.partial.wav로 남기는 경우).
+                마커 파일 이름은 복구 후의 녹음 파일 이름을 따름
+        """
+        if not self.markers:
+            return
+        try:
+            if cue:
+                write_cue_chunk(self.filename, [(sample, f"{trial}:{kind}:{label}")
+                                                for sample, kind, trial, label in self.markers])
+            samples, kinds, trials, labels = zip(*self.markers)
+            save_marker_sidecar(self.filename[:-len('.wav')] + '.markers.npz',
+                                samples, kinds, trials, labels, AudioConstants.SAMPLE_RATE)
+        except Exception as e:
+            print(f"마커 저장 오류: {str(e)}")
+        self.markers = []
+
+    def get_overflow_counts(self):
+        """
+        녹음 중 발생한 오버플로 통계를 반환합니다.
+
+        Returns:
+            dict: input_overflows(장치 입력 오버플로 콜백 수), status_errors(상태 플래그가
+                있었던 콜백 수), buffer_overflows(링 버퍼가 가득 차 버린 블록 수),
+                dropped_frames(버린 프레임 수)
+        """
+        return {
+            'input_overflows': self.input_overflows,
+            'status_errors': self.status_errors,
+            'buffer_overflows': self.ring_buffer.overflows,
+            'dropped_frames': self.ring_buffer.dropped_frames,
+        }
@@ -0,0 +1,397 @@
+import os
+import time
+import random
+import threading
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+import numpy as np
+
+class CallbackStop(Exception):
+    """콜백에서 발생시키면 스트림을 정상 종료합니다. (sounddevice.CallbackStop과 같은 역할)"""
+
+class AudioBackend(ABC):
+    """
+    오디오 입출력 인터페이스.
+
+    녹음기/재생기/장치 선택 창은 sounddevice를 직접 부르지 않고 이 인터페이스를 통해
+    스트림을 열고 장치를 조회합니다. 메서드 인자와 스트림 객체는 sounddevice와 같습니다.
+    모든 메서드가 추상 메서드이므로, 구현이 빠진 백엔드는 생성할 때 TypeError가 납니다.
+    """
+
+    CallbackStop = CallbackStop
+
+    @abstractmethod
+    def input_stream(self, **kwargs):
+        """sd.InputStream과 같은 인자로 입력 스트림을 만듭니다."""
+
+    @abstractmethod
+    def output_stream(self, **kwargs):
+        """sd.OutputStream과 같은 인자로 출력 스트림을 만듭니다."""
+
+    @abstractmethod
+    def query_devices(self, device=None, kind=None):
+        """sd.query_devices와 같이 장치 목록 또는 장치 하나의 정보를 반환합니다."""
+
+    @abstractmethod
+    def query_hostapis(self):
+        """sd.query_hostapis와 같이 호스트 API 목록을 반환합니다."""
+
+    @abstractmethod
+    def rec(self, frames, samplerate, channels, device=None):
+        """frames 길이만큼 녹음한 배열을 반환합니다. (wait로 완료 대기)"""
+
+    @abstractmethod
+    def play(self, data, samplerate):
+        """배열을 재생합니다. (wait로 완료 대기)"""
+
+    @abstractmethod
+    def wait(self):
+        """rec/play가 끝날 때까지 기다립니다."""
+
+    @abstractmethod
+    def stop(self):
+        """rec/play를 중지합니다."""
+
+class SoundDeviceBackend(AudioBackend):
+    """실제 장치를 사용하는 sounddevice 백엔드"""
+
+    def __init__(self):
+        import sounddevice as sd
+        self.sd = sd
+        self.CallbackStop = sd.CallbackStop
+
+    def input_stream(self, **kwargs):
+        return self.sd.InputStream(**kwargs)
+
+    def output_stream(self, **kwargs):
+        return self.sd.OutputStream(**kwargs)
+
+    def query_devices(self, device=None, kind=None):
+        return self.sd.query_devices(device, kind)
+
+    def query_hostapis(self):
+        return self.sd.query_hostapis()
+
+    def rec(self, frames, samplerate, channels, device=None):
+        return self.sd.rec(frames, samplerate=samplerate, channels=channels, device=device)
+
+    def play(self, data, samplerate):
+        self.sd.play(data, samplerate)
+
+    def wait(self):
+        self.sd.wait()
+
+    def stop(self):
+        self.sd.stop()
+
+class SimulatedStatus:
+    """sd.CallbackFlags 대용: 플래그가 하나라도 있으면 참"""
+
+    def __init__(self, input_overflow=False, output_underflow=False):
+        self.input_overflow = input_overflow
+        self.output_underflow = output_underflow
+
+    def __bool__(self):
+        return self.input_overflow or self.output_underflow
+
+    def __str__(self):
+        flags = [name for name in ('input_overflow', 'output_underflow') if getattr(self, name)]
+        return ', '.join(flags) or 'ok'
+
+class SimulatedStream:
+    """
+    SimulatedBackend의 입력/출력 스트림.
+
+    별도 스레드에서 blocksize 단위로 콜백을 부릅니다. speed가 1이면 실제 시간에 맞춰,
+    더 크면 그만큼 빠르게 진행하고, None이면 쉬지 않고 진행하며 시계는 처리한 프레임
+    수로 계산합니다. PortAudio는 스트림 시계가 단조 증가한다는 것만 보장하고 기준점은
+    정하지 않으므로, 스트림마다 임의의 기준점에서 시작하는 별도 시계를 씁니다.
+    (스트림 간 시각 비교에는 AudioRecorder.measure_clock_offset 사용)
+    """
+
+    def __init__(self, backend, kind, samplerate=None, blocksize=None, latency=None, dtype='float32',
+                 channels=1, callback=None, finished_callback=None, device=None, **kwargs):
+        self.backend = backend
+        self.kind = kind
+        self.samplerate = float(samplerate or backend.samplerate)
+        self.blocksize = blocksize or backend.default_blocksize
+        self.latency = backend.resolve_latency(latency)
+        self.dtype = dtype
+        self.channels = channels
+        self.device = device
+        self.callback = callback
+        self.finished_callback = finished_callback
+
+        self.frames_processed = 0
+        self.block_index = 0
+        self.callback_durations = []  # 콜백 실행 시간 (초, 벤치마크용)
+        self.active = False
+        self.stopped = True
+        self.finished = threading.Event()
+        self._thread = None
+        self._origin = None
+        self.start_time = None  # 첫 블록 첫 샘플의 스트림 시각
+
+    @property
+    def time(self):
+        """스트림 시계 (초, 가상 시각)"""
+        if self.start_time is None:
+            return self.backend.CLOCK_START
+        if self.backend.speed is not None:
+            return self.start_time + (time.perf_counter() - self._origin) * self.backend.speed
+        return self.start_time + self.frames_processed / self.samplerate
+
+    def start(self):
+        self.active = True
+        self.stopped = False
+        self.finished.clear()
+        self._origin = time.perf_counter()
+        self.start_time = self.backend.clock_origin()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        block = np.zeros((self.blocksize, self.channels), dtype=self.dtype)
+        block_duration = self.blocksize / self.samplerate
+        try:
+            while not self.stopped:
+                elapsed = self.frames_processed / self.samplerate
+                adc_time = self.start_time + elapsed
+                if self.backend.speed is not None:
+                    # 블록이 모두 쌓인 시각까지 대기
+                    target = self._origin + (elapsed + block_duration) / self.backend.speed
+                    delay = target - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                if self.stopped:
+                    break
+
+                status = self.backend.next_status(self.kind, self.block_index)
+                time_info = SimpleNamespace(
+                    inputBufferAdcTime=adc_time,
+                    outputBufferDacTime=adc_time + block_duration + self.latency,
+                    currentTime=adc_time + block_duration,
+                )
+                if self.kind == 'input':
+                    exhausted = not self.backend.read_input(block)
+                    started = time.perf_counter()
+                    try:
+                        self.callback(block, self.blocksize, time_info, status)
+                    finally:
+                        self.callback_durations.append(time.perf_counter() - started)
+                else:
+                    block.fill(0)
+                    started = time.perf_counter()
+                    try:
+                        self.callback(block, self.blocksize, time_info, status)
+                    finally:
+                        self.callback_durations.append(time.perf_counter() - started)
+                        self.backend.write_output(block, self)
+                    exhausted = False
+
+                self.frames_processed += self.blocksize
+                self.block_index += 1
+                if exhausted:
+                    break
+        except self.backend.CallbackStop:
+            pass
+        finally:
+            self.active = False
+            self.finished.set()
+            if self.finished_callback:
+                self.finished_callback()
+
+    def stop(self):
+        self.stopped = True
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.active = False
+
+    def abort(self):
+        self.stop()
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SimulatedBackend(AudioBackend):
+    """
+    메모리 버퍼로 녹음/재생을 흉내 내는 백엔드. (장치 없는 환경의 테스트와 벤치마크용)
+
+    입력 스트림은 input_data를 순서대로 내보내고(끝나면 loop_input이 True이면 반복, False이면
+    스트림 종료), 입력 신호가 없으면 무음을 내보냅니다.
+    출력 스트림이 내보낸 블록은 output_blocks에 쌓입니다.
+
+    xrun 주입:
+        xrun_blocks: 상태 플래그를 세울 블록 번호 집합 (스트림마다 0부터)
+        xrun_rate: 블록마다 xrun이 날 확률 (seed로 재현 가능)
+    """
+
+    # 실제 장치처럼 0이 아닌 시각에서 시작하는 가상 시계
+    CLOCK_START = 100.0
+
+    def __init__(self, input_data=None, samplerate=44100, speed=1.0, loop_input=True,
+                 default_blocksize=512, xrun_blocks=(), xrun_rate=0.0, seed=0):
+        """
+        Args:
+            input_data (np.ndarray, optional): 입력으로 내보낼 신호 (프레임 수, 채널 수) 또는 1차원
+            samplerate (int): 기본 샘플링 레이트
+            speed (float | None): 1이면 실제 시간, 클수록 빠르게, None이면 대기 없이 진행
+            loop_input (bool): False이면 input_data가 끝날 때 입력 스트림을 종료
+            default_blocksize (int): blocksize가 0/None일 때 사용할 블록 크기
+        """
+        self.samplerate = samplerate
+        self.speed = speed
+        self.loop_input = loop_input
+        self.default_blocksize = default_blocksize
+        self.xrun_blocks = set(xrun_blocks)
+        self.xrun_rate = xrun_rate
+        self.random = random.Random(seed)
+        # xrun 순서가 바뀌지 않도록 시계 기준점은 별도 난수열 사용
+        self.clock_random = random.Random(None if seed is None else seed + 1)
+        self.set_input(input_data)
+
+        self.output_blocks = []
+        self.output_frames = 0
+        self.xruns = 0
+        self._rec_result = None
+        self.devices = [
+            {'name': 'Simulated Input', 'index': 0, 'max_input_channels': 2, 'max_output_channels': 0,
+             'default_samplerate': float(samplerate), 'hostapi': 0,
+             'default_low_input_latency': self.resolve_latency('low'),
+             'default_high_input_latency': self.resolve_latency('high'),
+             'default_low_output_latency': 0.0, 'default_high_output_latency': 0.0},
+            {'name': 'Simulated Output', 'index': 1, 'max_input_channels': 0, 'max_output_channels': 2,
+             'default_samplerate': float(samplerate), 'hostapi': 0,
+             'default_low_input_latency': 0.0, 'default_high_input_latency': 0.0,
+             'default_low_output_latency': self.resolve_latency('low'),
+             'default_high_output_latency': self.resolve_latency('high')},
+        ]
+        self.hostapis = [{'name': 'Simulated', 'devices': [0, 1],
+                          'default_input_device': 0, 'default_output_device': 1}]
+
+    def set_input(self, input_data):
+        """입력 신호를 바꿉니다. None이면 무음"""
+        if input_data is None:
+            input_data = np.zeros((0, 1), dtype=np.float32)
+        input_data = np.asarray(input_data)
+        if input_data.ndim == 1:
+            input_data = input_data[:, None]
+        self.input_data = input_data
+        self.input_pos = 0
+
+    def clock_origin(self):
+        """새 스트림 시계의 기준점 (스트림마다 다름)"""
+        return self.CLOCK_START + self.clock_random.uniform(0.0, 1000.0)
+
+    @staticmethod
+    def resolve_latency(latency):
+        if latency in (None, 'high'):
+            return 0.1
+        if latency == 'low':
+            return 0.01
+        return float(latency)
+
+    def next_status(self, kind, block_index):
+        xrun = block_index in self.xrun_blocks or (self.xrun_rate and self.random.random() < self.xrun_rate)
+        if xrun:
+            self.xruns += 1
+        if kind == 'input':
+            return SimulatedStatus(input_overflow=bool(xrun))
+        return SimulatedStatus(output_underflow=bool(xrun))
+
+    def read_input(self, block):
+        """입력 신호를 block에 채웁니다. 신호가 끝났으면 False"""
+        n = len(block)
+        total = len(self.input_data)
+        if total == 0:
+            block.fill(0)
+            return self.loop_input
+        if self.loop_input:
+            idx = (self.input_pos + np.arange(n)) % total
+            block[:] = self.input_data[idx, :block.shape[1]]
+            self.input_pos = (self.input_pos + n) % total
+            return True
+        remaining = max(total - self.input_pos, 0)
+        m = min(n, remaining)
+        block[:m] = self.input_data[self.input_pos:self.input_pos + m, :block.shape[1]]
+        block[m:] = 0
+        self.input_pos += m
+        return self.input_pos < total
+
+    def write_output(self, block, stream):
+        self.output_blocks.append(block.copy())
+        self.output_frames += len(block)
+
+    def played_audio(self):
+        """출력 스트림이 내보낸 신호 전체"""
+        if not self.output_blocks:
+            return np.zeros((0, 1), dtype=np.float32)
+        return np.concatenate(self.output_blocks)
+
+    def input_stream(self, **kwargs):
+        return SimulatedStream(self, 'input', **kwargs)
+
+    def output_stream(self, **kwargs):
+        return SimulatedStream(self, 'output', **kwargs)
+
+    def query_devices(self, device=None, kind=None):
+        if kind == 'input':
+            return self.devices[0]
+        if kind == 'output':
+            return self.devices[1]
+        if device is not None:
+            return self.devices[device]
+        return list(self.devices)
+
+    def query_hostapis(self):
+        return list(self.hostapis)
+
+    def rec(self, frames, samplerate, channels, device=None):
+        block = np.zeros((frames, channels), dtype=np.float32)
+        self.read_input(block)
+        if self.speed:
+            time.sleep(frames / samplerate / self.speed)
+        return block
+
+    def play(self, data, samplerate):
+        data = np.asarray(data, dtype=np.float32)
+        self.output_blocks.append(data.reshape(len(data), -1))
+        self.output_frames += len(data)
+        if self.speed:
+            time.sleep(len(data) / samplerate / self.speed)
+
+    def wait(self):
+        pass
+
+    def stop(self):
+        pass
+
+_backend = None
+
+def get_backend():
+    """
+    현재 오디오 백엔드를 반환합니다.
+
+    처음 호출할 때 환경 변수 AUDIO_BACKEND가 'simulated'이면 SimulatedBackend를,
+    아니면 SoundDeviceBackend를 만듭니다.
+    """
+    global _backend
+    if _backend is None:
+        if os.environ.get('AUDIO_BACKEND', 'sounddevice') == 'simulated':
+            _backend = SimulatedBackend()
+        else:
+            _backend = SoundDeviceBackend()
+    return _backend
+
+def set_backend(backend):
+    """오디오 백엔드를 바꿉니다. (테스트/벤치마크에서 SimulatedBackend 주입)"""
+    global _backend
+    _backend = backend
+    return backend
@@ -0,0 +1,165 @@
+"""
+SimulatedBackend로 녹음기/재생기를 장치 없이 실행해 성능을 측정합니다.
+
+exp_src_files 디렉토리에서 실행:
+    python -m audio.backend_benchmark --seconds 60 --blocksize 256 --xrun-rate 0.001
+"""
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import soundfile as sf
+from audio import AudioConstants, AudioRecorder, AudioPlayer
+from audio.backend import SimulatedBackend
+
+def _test_signal(seconds, samplerate, frequency=220.0):
+    t = np.arange(int(seconds * samplerate)) / samplerate
+    return (0.3 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+def _summarize_durations(durations):
+    values = np.asarray(durations) * 1e6
+    if len(values) == 0:
+        return '-'
+    return f"평균 {values.mean():.1f}us / p99 {np.percentile(values, 99):.1f}us / 최대 {values.max():.1f}us"
+
+def benchmark_recorder(seconds=60.0, blocksize=256, xrun_rate=0.0, speed=20.0, n_markers=50, seed=0):
+    """
+    녹음기에 seconds 길이의 신호를 넣어 콜백 시간, 처리량, 마커 정확도를 측정합니다.
+
+    Returns:
+        dict: 측정 결과
+    """
+    samplerate = AudioConstants.SAMPLE_RATE
+    backend = SimulatedBackend(_test_signal(seconds, samplerate), samplerate=samplerate,
+                               speed=speed, loop_input=False, xrun_rate=xrun_rate, seed=seed)
+
+    with tempfile.TemporaryDirectory() as folder:
+        recorder = AudioRecorder(0, folder, latency_profile={'blocksize': blocksize}, backend=backend)
+        started = time.perf_counter()
+        recorder.start_recording('bench_stage1')
+        stream = recorder.stream
+
+        # 스트림 진행 중 마커를 찍고, 그 시점의 스트림 시계로 계산한 기대 위치와 비교
+        errors = []
+        for trial in range(1, n_markers + 1):
+            if stream.finished.is_set():
+                break
+            sample = recorder.add_marker('onset', trial)
+            expected = (stream.time - stream.start_time) * samplerate
+            if sample is not None:  # 첫 콜백 전 마커는 위치 계산이 미뤄짐
+                errors.append(sample - expected)
+            time.sleep(0.001 if speed is None else seconds / speed / n_markers / 2)
+
+        stream.finished.wait()
+        recorder.stop_recording()
+        elapsed = time.perf_counter() - started
+
+        written = sf.info(recorder.filename).frames
+        counts = recorder.get_overflow_counts()
+
+    errors = np.abs(np.asarray(errors)) if errors else np.zeros(1)
+    return {
+        '입력 프레임': stream.frames_processed,
+        '기록 프레임': written,
+        '소요 시간(초)': round(elapsed, 3),
+        '처리량(실시간 배수)': round(stream.frames_processed / samplerate / elapsed, 1),
+        '콜백 시간': _summarize_durations(stream.callback_durations),
+        '주입한 xrun': backend.xruns,
+        '감지한 입력 오버플로': counts['input_overflows'],
+        '버퍼 오버플로': counts['buffer_overflows'],
+        '마커 오차(샘플)': f"평균 {errors.mean():.1f} / 최대 {errors.max():.1f}",
+    }
+
+def benchmark_player(seconds=10.0, blocksize=256, speed=20.0):
+    """
+    재생기로 같은 자극을 두 번 연속 재생해 출력, 시작 지연, 자극 사이 간격을 측정합니다.
+    """
+    samplerate = AudioConstants.SAMPLE_RATE
+    backend = SimulatedBackend(samplerate=samplerate, speed=speed)
+    signal = _test_signal(seconds, samplerate)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'stimulus.wav')
+        sf.write(path, signal, samplerate)
+        player = AudioPlayer(folder, latency_profile={'blocksize': blocksize}, backend=backend)
+        started = time.perf_counter()
+        first = player.queue_stimulus(path)
+        second = player.queue_stimulus(path)
+        second.done.wait()
+        elapsed = time.perf_counter() - started
+        stream = player.stream
+        player.close()
+
+    # DAC 시각을 출력 버퍼의 프레임 위치로 변환해 실제로 나간 신호와 비교
+    onset_index = int(round((first.dac_onset - stream.start_time - stream.latency) * samplerate)) - stream.blocksize
+    played = backend.played_audio()[:, 0]
+    expected = np.concatenate([signal, signal])
+    return {
+        '자극 프레임': len(signal),
+        '출력 프레임': backend.output_frames,
+        '소요 시간(초)': round(elapsed, 3),
+        '콜백 시간': _summarize_durations(stream.callback_durations),
+        '시작 지연(ms)': round(first.onset_latency * 1000, 2),
+        '자극 사이 간격(샘플)': int(round((second.dac_onset - first.dac_offset) * samplerate)),
+        '출력 일치': bool(np.allclose(played[onset_index:onset_index + len(expected)], expected, atol=1e-4)),
+    }
+
+def benchmark_clock_offset(speed=20.0, repeats=20):
+    """
+    녹음/재생 스트림 시계의 오프셋 측정 오차를 잽니다. (스트림마다 시계 기준점이 다름)
+
+    Returns:
+        dict: 측정 결과
+    """
+    samplerate = AudioConstants.SAMPLE_RATE
+    backend = SimulatedBackend(samplerate=samplerate, speed=speed)
+
+    with tempfile.TemporaryDirectory() as folder:
+        recorder = AudioRecorder(0, folder, backend=backend)
+        player = AudioPlayer(folder, backend=backend)
+        recorder.start_recording('bench_stage3')
+        player.open_stream(samplerate)
+        origin_gap = recorder.stream.start_time - player.stream.start_time
+        errors = []
+        for _ in range(repeats):
+            measured = recorder.measure_clock_offset(player.stream)
+            # 가상 시계의 실제 차이: 기준점 차이 - 시작 시각 차이만큼 흐른 시간
+            rec, out = recorder.stream, player.stream
+            actual = (rec.start_time - out.start_time) - (rec._origin - out._origin) * speed
+            errors.append(abs(measured - actual) * samplerate)
+        player.close()
+        recorder.stop_recording()
+
+    errors = np.asarray(errors)
+    return {
+        '시계 기준점 차이(초)': round(origin_gap, 3),
+        '오프셋 오차(샘플)': f"평균 {errors.mean():.2f} / 최대 {errors.max():.2f}",
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='SimulatedBackend 녹음/재생 벤치마크')
+    parser.add_argument('--seconds', type=float, default=60.0, help='녹음 길이 (초)')
+    parser.add_argument('--blocksize', type=int, default=256)
+    parser.add_argument('--xrun-rate', type=float, default=0.0, help='블록당 xrun 주입 확률')
+    parser.add_argument('--speed', type=float, default=20.0, help='1이면 실제 시간, 0이면 대기 없이 진행')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    speed = args.speed or None
+
+    print("=== 녹음기 ===")
+    for key, value in benchmark_recorder(args.seconds, args.blocksize, args.xrun_rate,
+                                         speed, seed=args.seed).items():
+        print(f"{key}: {value}")
+
+    print("\n=== 재생기 ===")
+    for key, value in benchmark_player(min(args.seconds, 10.0), args.blocksize, speed).items():
+        print(f"{key}: {value}")
+
+    if speed is not None:
+        print("\n=== 스트림 시계 오프셋 ===")
+        for key, value in benchmark_clock_offset(speed).items():
+            print(f"{key}: {value}")
+
+if __name__ == "__main__":
+    main()
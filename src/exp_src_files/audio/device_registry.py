@@ -0,0 +1,106 @@
+import time
+from audio.backend import get_backend
+
+class DeviceRegistry:
+    """
+    오디오 장치 정보를 세션 동안 한 번만 조회해 보관하는 레지스트리.
+
+    PortAudio 장치 조회는 호스트에 따라 수백 ms가 걸릴 수 있으므로, 장치 선택 창에서
+    snapshot을 찍은 뒤 저장 경로(Info 시트의 녹음장치 등)에서는 이 값만 사용합니다.
+    """
+
+    FIELDS = ('name', 'hostapi', 'max_input_channels', 'max_output_channels', 'default_samplerate',
+              'default_low_input_latency', 'default_high_input_latency',
+              'default_low_output_latency', 'default_high_output_latency')
+
+    def __init__(self, backend=None):
+        self.backend = backend or get_backend()
+        self.devices = None          # {장치 번호: 정보 dict}
+        self.hostapis = []
+        self.default_input = None
+        self.default_output = None
+        self.snapshot_seconds = None  # 조회에 걸린 시간
+
+    def snapshot(self):
+        """장치와 호스트 API 정보를 조회해 보관합니다. (장치를 새로 연결했다면 다시 호출)"""
+        started = time.perf_counter()
+        devices = list(self.backend.query_devices())
+        self.devices = {}
+        for index, device in enumerate(devices):
+            info = {field: device.get(field) for field in self.FIELDS}
+            info['index'] = device.get('index', index)
+            self.devices[info['index']] = info
+
+        try:
+            self.hostapis = [dict(api) for api in self.backend.query_hostapis()]
+        except Exception:
+            self.hostapis = []
+        for info in self.devices.values():
+            api = info['hostapi']
+            info['hostapi_name'] = self.hostapis[api]['name'] if api is not None and api < len(self.hostapis) else ''
+
+        self.default_input = self._default_index('input')
+        self.default_output = self._default_index('output')
+        self.snapshot_seconds = time.perf_counter() - started
+        return self
+
+    def _default_index(self, kind):
+        try:
+            device = self.backend.query_devices(kind=kind)
+        except Exception:
+            return None
+        index = device.get('index')
+        if index is None:
+            # 'index' 키가 없으면 이름으로 찾음
+            index = next((i for i, info in self.devices.items() if info['name'] == device['name']), None)
+        return index
+
+    def _ensure(self):
+        if self.devices is None:
+            self.snapshot()
+
+    def get(self, index):
+        """장치 정보 dict (없으면 None)"""
+        self._ensure()
+        return self.devices.get(index)
+
+    def name(self, index):
+        """장치 이름 (index가 None이거나 없는 장치면 빈 문자열)"""
+        if index is None:
+            return ''
+        info = self.get(index)
+        return info['name'] if info else ''
+
+    def input_devices(self):
+        """입력 채널이 있는 장치 목록 (장치 번호 순)"""
+        self._ensure()
+        return [info for info in self.devices.values() if (info['max_input_channels'] or 0) > 0]
+
+    def info_columns(self, index):
+        """
+        Info 시트에 기록할 장치 정보.
+
+        Returns:
+            dict: {열 이름: 값}
+        """
+        info = self.get(index) if index is not None else None
+        if info is None:
+            return {'녹음장치': ''}
+        return {
+            '녹음장치': info['name'],
+            '호스트API': info['hostapi_name'],
+            '장치_기본샘플레이트': info['default_samplerate'],
+            '장치_기본입력지연_초': info['default_low_input_latency'],
+        }
+
+_registry = None
+
+def get_registry():
+    """
+    현재 백엔드의 장치 레지스트리를 반환합니다. (백엔드가 바뀌면 새로 만듦)
+    """
+    global _registry
+    backend = get_backend()
+    if _registry is None or _registry.backend is not backend:
+        _registry = DeviceRegistry(backend)
+    return _registry
@@ -0,0 +1,87 @@
+import math
+import numpy as np
+
+CLIP_LEVEL = 0.999
+
+def to_dbfs(value):
+    """진폭(0~1)을 dBFS로 변환합니다."""
+    return 20 * math.log10(max(value, 1e-10))
+
+class LevelMeter:
+    """
+    녹음 콜백에서 블록별 RMS/피크/클리핑 수를 계산하는 입력 레벨 측정기.
+
+    콜백은 process만 호출하고, UI는 current를 after()로 주기적으로 읽습니다.
+    값은 튜플 하나로 통째로 바꾸므로 잠금 없이 읽어도 일관된 값을 얻습니다.
+    시행별 통계는 mark로 시작 시점을 기록한 뒤 stats_since로 계산합니다.
+    """
+
+    def __init__(self, clip_level=CLIP_LEVEL):
+        self.clip_level = clip_level
+        self.reset()
+
+    def reset(self):
+        # 마지막 블록 (rms, peak, clips)
+        self.level = (0.0, 0.0, 0)
+        # 누적 (프레임 수, 제곱합, 클리핑 수)
+        self.totals = (0, 0.0, 0)
+        # 구간 최대 피크: UI가 epoch를 올리면 콜백이 다음 블록에서 새로 시작
+        self.epoch = 0
+        self._peak_epoch = 0
+        self._window_peak = 0.0
+
+    def process(self, block):
+        """콜백에서 호출: 블록 하나의 레벨을 계산해 공유 값을 갱신합니다."""
+        x = block[:, 0] if block.ndim > 1 else block
+        if x.dtype.kind == 'i':
+            # 정수 샘플(int16 스트림)은 -1~1 범위로 변환
+            x = x.astype(np.float32) / (np.iinfo(x.dtype).max + 1)
+        n = len(x)
+        if n == 0:
+            return
+        sum_sq = float(np.dot(x, x))
+        peak = float(max(x.max(), -x.min()))
+        # 피크가 임계값 미만이면 클리핑 샘플을 셀 필요가 없음
+        clips = int(np.count_nonzero(np.abs(x) >= self.clip_level)) if peak >= self.clip_level else 0
+
+        if self._peak_epoch != self.epoch:
+            self._peak_epoch = self.epoch
+            self._window_peak = 0.0
+        self._window_peak = max(self._window_peak, peak)
+
+        frames, total_sq, total_clips = self.totals
+        self.totals = (frames + n, total_sq + sum_sq, total_clips + clips)
+        self.level = (math.sqrt(sum_sq / n), peak, clips)
+
+    def current(self):
+        """
+        UI에서 호출: 마지막 블록의 레벨을 반환합니다.
+
+        Returns:
+            tuple: (rms_dbfs, peak_dbfs, clips)
+        """
+        rms, peak, clips = self.level
+        return to_dbfs(rms), to_dbfs(peak), clips
+
+    def mark(self):
+        """시행 시작 시점의 누적 값을 기록하고 구간 최대 피크를 초기화합니다."""
+        self.epoch += 1
+        return self.totals
+
+    def stats_since(self, mark):
+        """
+        mark 이후 구간의 레벨 통계를 계산합니다.
+
+        Returns:
+            dict: 평균레벨_dBFS, 최대레벨_dBFS, 클리핑_샘플수
+        """
+        frames, total_sq, total_clips = self.totals
+        start_frames, start_sq, start_clips = mark
+        n = frames - start_frames
+        rms = math.sqrt((total_sq - start_sq) / n) if n > 0 else 0.0
+        peak = self._window_peak if self._peak_epoch == self.epoch else 0.0
+        return {
+            '평균레벨_dBFS': round(to_dbfs(rms), 1),
+            '최대레벨_dBFS': round(to_dbfs(peak), 1),
+            '클리핑_샘플수': total_clips - start_clips,
+        }
@@ -0,0 +1,153 @@
+import os
+import re
+import glob
+import struct
+import argparse
+from collections import defaultdict
+import soundfile as sf
+
+PARTIAL_SUFFIX = '.partial.wav'
+# {참가자번호}_stage{단계}_{YYYYmmdd_HHMM}[.partial].wav
+RECORDING_PATTERN = re.compile(r'^(?P<participant>[^_]+)_stage(?P<stage>\d+)_(?P<time>\d{8}_\d{4})'
+                               r'(?P<partial>\.partial)?\.wav$')
+
+def repair_wav_header(file_path):
+    """
+    비정상 종료로 남은 WAV 파일의 RIFF/data 크기를 실제 파일 크기에 맞게 고칩니다.
+
+    녹음 중에는 헤더가 주기적으로만 갱신되므로 마지막 갱신 이후 기록된 샘플은 헤더에
+    반영되지 않습니다. data 청크 이후의 모든 바이트를 샘플로 보고 크기를 다시 씁니다.
+
+    Args:
+        file_path (str): WAV 파일 경로
+
+    Returns:
+        int: 복구된 프레임 수
+    """
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'r+b') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f"WAV 파일이 아닙니다: {file_path}")
+
+        block_align = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"data 청크를 찾을 수 없습니다: {file_path}")
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                block_align = struct.unpack('<H', fmt[12:14])[0]
+                f.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                data_offset = f.tell()
+                break
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+        if not block_align:
+            raise ValueError(f"fmt 청크를 찾을 수 없습니다: {file_path}")
+
+        # 마지막 프레임이 잘려 있으면 버림
+        data_size = (file_size - data_offset) // block_align * block_align
+        f.seek(data_offset - 4)
+        f.write(struct.pack('<I', data_size))
+        f.seek(4)
+        f.write(struct.pack('<I', data_offset - 8 + data_size))
+        f.truncate(data_offset + data_size)
+
+    return data_size // block_align
+
+def concatenate_recordings(file_paths, output_path, blocksize=65536):
+    """
+    여러 녹음 파일을 순서대로 이어 붙여 하나의 WAV로 저장합니다. (블록 단위로 복사)
+
+    Args:
+        file_paths (list): 이어 붙일 파일 경로 (순서대로)
+        output_path (str): 저장할 경로
+
+    Returns:
+        int: 저장된 프레임 수
+    """
+    info = sf.info(file_paths[0])
+    total = 0
+    with sf.SoundFile(output_path, mode='w', samplerate=info.samplerate,
+                      channels=info.channels, subtype=info.subtype) as out:
+        for path in file_paths:
+            if sf.info(path).samplerate != info.samplerate:
+                raise ValueError(f"샘플링 레이트가 다릅니다: {path}")
+            for block in sf.blocks(path, blocksize=blocksize, always_2d=True):
+                out.write(block)
+                total += len(block)
+    return total
+
+def find_recordings(folder_path):
+    """
+    폴더의 단계 녹음 파일을 (참가자번호, 단계)별로 시간 순으로 묶습니다.
+
+    Returns:
+        dict: {(참가자번호, 단계): [(경로, partial 여부), ...]}
+    """
+    groups = defaultdict(list)
+    for path in sorted(glob.glob(os.path.join(folder_path, '*.wav'))):
+        match = RECORDING_PATTERN.match(os.path.basename(path))
+        if match:
+            key = (match['participant'], int(match['stage']))
+            groups[key].append((match['time'], path, match['partial'] is not None))
+    return {key: [(path, partial) for _, path, partial in sorted(items)]
+            for key, items in groups.items()}
+
+def recover_recordings(folder_path, concatenate=True):
+    """
+    폴더에 남은 .partial.wav 녹음을 복구합니다.
+
+    1. 각 .partial.wav의 헤더를 실제 길이에 맞게 고치고 .wav로 이름을 바꿉니다.
+    2. concatenate=True이고 같은 참가자/단계의 녹음이 여러 개이면(중단 후 재시작)
+       시간 순으로 이어 붙여 {참가자번호}_stage{단계}_recovered.wav로 저장합니다.
+       원본 파일은 그대로 둡니다.
+
+    Args:
+        folder_path (str): 참가자 폴더 경로
+        concatenate (bool): 같은 단계의 녹음을 이어 붙일지 여부
+
+    Returns:
+        list: 복구/생성된 파일 경로
+    """
+    recovered = []
+    for (participant, stage), items in find_recordings(folder_path).items():
+        if not any(partial for _, partial in items):
+            continue
+
+        paths = []
+        for path, partial in items:
+            if partial:
+                n_frames = repair_wav_header(path)
+                fixed_path = path[:-len(PARTIAL_SUFFIX)] + '.wav'
+                os.replace(path, fixed_path)
+                print(f"복구: {os.path.basename(fixed_path)} ({n_frames}프레임)")
+                recovered.append(fixed_path)
+                path = fixed_path
+            paths.append(path)
+
+        if concatenate and len(paths) > 1:
+            output_path = os.path.join(folder_path, f"{participant}_stage{stage}_recovered.wav")
+            n_frames = concatenate_recordings(paths, output_path)
+            print(f"병합: {len(paths)}개 파일 -> {os.path.basename(output_path)} ({n_frames}프레임)")
+            recovered.append(output_path)
+
+    if not recovered:
+        print("복구할 녹음 파일이 없습니다.")
+    return recovered
+
+def main():
+    parser = argparse.ArgumentParser(description='중단된 단계 녹음(.partial.wav) 복구')
+    parser.add_argument('folders', nargs='+', help='참가자 폴더 경로')
+    parser.add_argument('--no-concat', action='store_true', help='같은 단계 녹음을 이어 붙이지 않음')
+    args = parser.parse_args()
+
+    for folder in args.folders:
+        recover_recordings(folder, concatenate=not args.no_concat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import numpy as np
+
+class RingBuffer:
+    """
+    오디오 콜백용으로 미리 할당한 링 버퍼 (생산자 1개, 소비자 1개, 기본 float32).
+
+    생산자(오디오 콜백)는 write만, 소비자(작성 스레드)는 read만 호출합니다.
+    write_pos는 생산자만, read_pos는 소비자만 갱신하므로 잠금이 필요 없습니다.
+    위치 값은 누적 프레임 수이며 실제 인덱스는 capacity로 나눈 나머지입니다.
+    """
+
+    def __init__(self, seconds, samplerate, channels=1, dtype=np.float32):
+        """
+        Args:
+            seconds (float): 버퍼 길이 (초)
+            samplerate (int): 샘플링 레이트
+            channels (int): 채널 수
+            dtype: 샘플 형식 (스트림 dtype과 같아야 함)
+        """
+        self.capacity = int(seconds * samplerate)
+        self.buffer = np.zeros((self.capacity, channels), dtype=dtype)
+        self.write_pos = 0
+        self.read_pos = 0
+        self.overflows = 0         # 버퍼가 가득 차서 블록을 버린 횟수
+        self.dropped_frames = 0    # 버린 프레임 수
+
+    def available(self):
+        """읽을 수 있는 프레임 수"""
+        return self.write_pos - self.read_pos
+
+    def write(self, block):
+        """
+        블록을 버퍼에 복사합니다. (콜백에서 호출, 새 배열을 만들지 않음)
+
+        빈 공간이 부족하면 블록 전체를 버리고 overflows를 늘립니다.
+
+        Returns:
+            bool: 기록 여부
+        """
+        n = len(block)
+        if n > self.capacity - (self.write_pos - self.read_pos):
+            self.overflows += 1
+            self.dropped_frames += n
+            return False
+
+        start = self.write_pos % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            self.buffer[start:end] = block
+        else:
+            split = self.capacity - start
+            self.buffer[start:] = block[:split]
+            self.buffer[:end - self.capacity] = block[split:]
+        # 데이터를 복사한 뒤에 위치를 갱신해야 소비자가 완성된 프레임만 읽음
+        self.write_pos += n
+        return True
+
+    def read(self, max_frames=None):
+        """
+        쌓인 프레임을 꺼냅니다. (소비자 스레드에서 호출)
+
+        Args:
+            max_frames (int, optional): 최대 프레임 수. None이면 전부
+
+        Returns:
+            np.ndarray: (프레임 수, 채널 수) 배열 복사본
+        """
+        n = self.available()
+        if max_frames is not None:
+            n = min(n, max_frames)
+        start = self.read_pos % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            data = self.buffer[start:end].copy()
+        else:
+            data = np.concatenate((self.buffer[start:], self.buffer[:end - self.capacity]))
+        self.read_pos += n
+        return data
+
+    def reset(self):
+        """위치와 통계를 초기화합니다. (생산자/소비자가 모두 멈춘 상태에서 호출)"""
+        self.write_pos = 0
+        self.read_pos = 0
+        self.overflows = 0
+        self.dropped_frames = 0
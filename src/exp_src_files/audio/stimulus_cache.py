@@ -0,0 +1,110 @@
+import os
+import time
+import threading
+import numpy as np
+import soundfile as sf
+from audio.stimulus_resampler import resample_audio, to_dtype
+
+class StimulusCache:
+    """
+    자극 음성 파일을 미리 디코딩해 메모리에 보관하는 캐시.
+
+    단계 안내 화면이 떠 있는 동안 preload_async로 백그라운드 디코딩을 시작하고,
+    재생할 때는 get으로 메모리의 연속 float32 배열을 바로 꺼냅니다.
+
+    samplerate를 주면 모든 자극을 출력 스트림의 샘플링 레이트로 변환해 두므로, 재생 중에
+    스트림을 다시 열거나 호스트가 실시간으로 변환하지 않습니다. resampler(ResampleCache)가
+    있으면 변환 결과를 디스크에 캐시해 다음 세션에서 재사용합니다.
+    """
+
+    def __init__(self, dtype='float32', samplerate=None, resampler=None):
+        self.dtype = dtype
+        self.samplerate = samplerate
+        self.resampler = resampler
+        self.arrays = {}        # {절대 경로: (1차원 배열, 샘플링 레이트)}
+        self.decode_times = {}  # {절대 경로: 디코딩 시간 (초)}
+        self.misses = 0         # 캐시에 없어 재생 시점에 디코딩한 횟수
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def _decode(self, path):
+        started = time.perf_counter()
+        if self.samplerate and self.resampler is not None:
+            data, samplerate = self.resampler.load(path, self.samplerate, self.dtype)
+        elif self.samplerate:
+            data, samplerate = sf.read(path, dtype='float32', always_2d=True)
+            data = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+            data = to_dtype(resample_audio(data, samplerate, self.samplerate), self.dtype)
+            samplerate = self.samplerate
+        else:
+            data, samplerate = sf.read(path, dtype=self.dtype, always_2d=True)
+            # 재생 스트림은 1채널이므로 미리 모노로 합치고 연속 배열로 만듦
+            data = np.ascontiguousarray(data.mean(axis=1) if data.shape[1] > 1 else data[:, 0],
+                                        dtype=self.dtype)
+        with self.lock:
+            self.arrays[path] = (data, samplerate)
+            self.decode_times[path] = time.perf_counter() - started
+        return data, samplerate
+
+    def preload(self, paths):
+        """
+        파일들을 디코딩해 캐시에 넣습니다. (이미 있는 파일은 건너뜀)
+
+        Returns:
+            int: 새로 디코딩한 파일 수
+        """
+        count = 0
+        for path in dict.fromkeys(os.path.abspath(p) for p in paths):
+            if path in self.arrays:
+                continue
+            try:
+                self._decode(path)
+                count += 1
+            except Exception as e:
+                print(f"자극 파일 로드 오류 ({os.path.basename(path)}): {str(e)}")
+        return count
+
+    def preload_async(self, paths):
+        """백그라운드 스레드에서 preload를 시작합니다. (이전 작업이 끝난 뒤 이어서 실행)"""
+        previous = self.thread
+        paths = list(paths)
+
+        def run():
+            if previous is not None:
+                previous.join()
+            self.preload(paths)
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def wait(self, timeout=None):
+        """백그라운드 로드가 끝날 때까지 기다립니다."""
+        if self.thread is not None:
+            self.thread.join(timeout)
+            return not self.thread.is_alive()
+        return True
+
+    def get(self, path):
+        """
+        디코딩된 자극을 반환합니다. 캐시에 없으면 지금 디코딩합니다.
+
+        Returns:
+            tuple: (1차원 배열, 샘플링 레이트)
+        """
+        path = os.path.abspath(path)
+        cached = self.arrays.get(path)
+        if cached is not None:
+            return cached
+        self.misses += 1
+        return self._decode(path)
+
+    def memory_bytes(self):
+        """캐시가 차지하는 메모리 (바이트)"""
+        return sum(data.nbytes for data, _ in self.arrays.values())
+
+    def clear(self):
+        self.wait()
+        with self.lock:
+            self.arrays.clear()
+            self.decode_times.clear()
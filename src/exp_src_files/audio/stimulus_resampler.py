@@ -0,0 +1,129 @@
+"""
+자극 음성을 출력 장치 샘플링 레이트로 미리 변환해 디스크에 캐시합니다.
+
+변환 결과는 파일 내용의 해시와 목표 샘플링 레이트/형식으로 저장하므로, 같은 자극은
+한 번만 변환되고 재생 시에는 메모리 복사만 하면 됩니다.
+
+exp_src_files 디렉토리에서 실행 (실험 전에 미리 변환):
+    python -m audio.stimulus_resampler ../audio-sample/short-version-phonetic --samplerate 48000
+"""
+import io
+import os
+import hashlib
+import argparse
+from math import gcd
+import numpy as np
+import soundfile as sf
+from scipy.signal import resample_poly
+
+def resample_audio(data, samplerate, target_rate):
+    """
+    폴리페이즈 필터(scipy.signal.resample_poly)로 샘플링 레이트를 바꿉니다.
+
+    Args:
+        data (np.ndarray): 1차원 float 신호
+        samplerate (int): 원래 샘플링 레이트
+        target_rate (int): 목표 샘플링 레이트
+
+    Returns:
+        np.ndarray: 변환된 float32 신호
+    """
+    samplerate, target_rate = int(samplerate), int(target_rate)
+    if samplerate == target_rate:
+        return np.asarray(data, dtype=np.float32)
+    factor = gcd(samplerate, target_rate)
+    up, down = target_rate // factor, samplerate // factor
+    # kaiser 창(beta=8.6)으로 저지대역 감쇠를 기본값보다 크게 함
+    resampled = resample_poly(np.asarray(data, dtype=np.float64), up, down, window=('kaiser', 8.6))
+    return resampled.astype(np.float32)
+
+def to_dtype(data, dtype):
+    """float 신호를 재생 형식(float32/int16)으로 바꿉니다."""
+    if np.dtype(dtype) == np.int16:
+        return (np.clip(data, -1.0, 1.0 - 1.0 / 32768) * 32768).astype(np.int16)
+    return np.ascontiguousarray(data, dtype=dtype)
+
+class ResampleCache:
+    """
+    변환된 자극을 .npy 파일로 보관하는 디스크 캐시.
+
+    키는 '<내용 SHA-1>_<샘플링 레이트>_<형식>'이므로 파일 이름이나 위치가 바뀌어도
+    내용이 같으면 다시 변환하지 않습니다.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.converted = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(raw, target_rate, dtype):
+        return f"{hashlib.sha1(raw).hexdigest()}_{int(target_rate)}_{np.dtype(dtype).name}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def load(self, path, target_rate, dtype):
+        """
+        자극 파일을 target_rate/dtype의 1차원 배열로 반환합니다. (캐시에 없으면 변환 후 저장)
+
+        Returns:
+            tuple: (1차원 배열, target_rate)
+        """
+        with open(path, 'rb') as f:
+            raw = f.read()
+        cache_path = self._path(self.key(raw, target_rate, dtype))
+        if os.path.exists(cache_path):
+            try:
+                data = np.load(cache_path)
+                self.hits += 1
+                return data, int(target_rate)
+            except Exception as e:
+                print(f"변환 캐시 읽기 오류 ({os.path.basename(path)}): {str(e)}")
+
+        data, samplerate = sf.read(io.BytesIO(raw), dtype='float32', always_2d=True)
+        data = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+        if int(samplerate) == int(target_rate):
+            # 변환이 필요 없는 파일은 캐시에 저장하지 않음
+            return to_dtype(data, dtype), int(target_rate)
+        data = to_dtype(resample_audio(data, samplerate, target_rate), dtype)
+
+        # 실험 도중 중단되어도 깨진 캐시가 남지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, data)
+        os.replace(tmp_path, cache_path)
+        self.converted += 1
+        return data, int(target_rate)
+
+def prepare_stimuli(paths, target_rate, dtype='float32', cache_dir='resampled_stimuli'):
+    """
+    자극 파일들을 미리 변환해 캐시에 넣습니다.
+
+    Returns:
+        ResampleCache: hits/converted 통계를 담은 캐시
+    """
+    cache = ResampleCache(cache_dir)
+    for path in paths:
+        try:
+            cache.load(path, target_rate, dtype)
+        except Exception as e:
+            print(f"자극 변환 오류 ({os.path.basename(path)}): {str(e)}")
+    return cache
+
+def main():
+    parser = argparse.ArgumentParser(description='자극 음성을 출력 샘플링 레이트로 미리 변환')
+    parser.add_argument('dirs', nargs='+', help='자극 WAV 폴더')
+    parser.add_argument('--samplerate', type=int, required=True, help='출력 장치 샘플링 레이트')
+    parser.add_argument('--dtype', default='float32', choices=['float32', 'int16'])
+    parser.add_argument('--cache-dir', default='resampled_stimuli')
+    args = parser.parse_args()
+
+    paths = [os.path.join(folder, f) for folder in args.dirs for f in sorted(os.listdir(folder))
+             if f.endswith('.wav') and not f.startswith('._')]
+    cache = prepare_stimuli(paths, args.samplerate, args.dtype, args.cache_dir)
+    print(f"자극 {len(paths)}개: 새로 변환 {cache.converted}개, 캐시 사용 {cache.hits}개")
+
+if __name__ == "__main__":
+    main()
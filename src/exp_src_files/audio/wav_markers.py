@@ -0,0 +1,74 @@
+import os
+import struct
+import numpy as np
+
+def write_cue_chunk(wav_path, markers):
+    """
+    WAV 파일 끝에 cue 청크와 라벨(LIST/adtl/labl) 청크를 덧붙입니다.
+
+    Praat, Audacity 등에서 마커로 읽을 수 있으며, 샘플 위치는 data 청크 기준입니다.
+
+    Args:
+        wav_path (str): 닫혀 있는 WAV 파일 경로
+        markers (list): [(샘플 위치, 라벨 문자열), ...]
+    """
+    if not markers:
+        return
+
+    cue = struct.pack('<I', len(markers))
+    labels = b''
+    for cue_id, (sample, label) in enumerate(markers, start=1):
+        # dwName, dwPosition, fccChunk, dwChunkStart, dwBlockStart, dwSampleOffset
+        cue += struct.pack('<II4sIII', cue_id, int(sample), b'data', 0, 0, int(sample))
+        text = label.encode('utf-8') + b'\x00'
+        labl = struct.pack('<4sII', b'labl', 4 + len(text), cue_id) + text
+        if len(labl) % 2:
+            labl += b'\x00'
+        labels += labl
+
+    chunks = struct.pack('<4sI', b'cue ', len(cue)) + cue
+    adtl = b'adtl' + labels
+    chunks += struct.pack('<4sI', b'LIST', len(adtl)) + adtl
+
+    with open(wav_path, 'r+b') as f:
+        f.seek(0, os.SEEK_END)
+        # 앞 청크가 홀수 길이면 패딩 바이트 추가
+        if f.tell() % 2:
+            f.write(b'\x00')
+        f.write(chunks)
+        riff_size = f.tell() - 8
+        f.seek(4)
+        f.write(struct.pack('<I', riff_size))
+
+def save_marker_sidecar(path, samples, kinds, trials, labels, samplerate):
+    """
+    마커를 .npz 배열로 저장합니다. (시행별 구간을 인덱스로 바로 자를 때 사용)
+
+    Args:
+        path (str): 저장할 .npz 경로
+        samples (list): 샘플 위치
+        kinds (list): 마커 종류 ('onset', 'stimulus_end', 'space')
+        trials (list): 시행 번호 (1부터)
+        labels (list): 단어 또는 음성 파일 이름
+        samplerate (int): 녹음 샘플링 레이트
+    """
+    np.savez(path,
+             sample=np.asarray(samples, dtype=np.int64),
+             kind=np.asarray(kinds, dtype=str),
+             trial=np.asarray(trials, dtype=np.int32),
+             label=np.asarray(labels, dtype=str),
+             samplerate=np.int64(samplerate))
+
+def load_marker_sidecar(path):
+    """
+    save_marker_sidecar로 저장한 마커를 시행별 표로 읽습니다.
+
+    Returns:
+        dict: {'samplerate': int, 'trials': {시행 번호: {'label': str, 종류: 샘플 위치, ...}}}
+    """
+    data = np.load(path)
+    trials = {}
+    for sample, kind, trial, label in zip(data['sample'], data['kind'], data['trial'], data['label']):
+        entry = trials.setdefault(int(trial), {'label': str(label)})
+        entry[str(kind)] = int(sample)
+    return {'samplerate': int(data['samplerate']), 'trials': trials}
@@ -17,6 +17,15 @@ class ConfigManager:
                 'main_word_list': os.path.abspath(os.path.join(os.getcwd(), 'main_words.xlsx')),
                 'practice_word_list': os.path.abspath(os.path.join(os.getcwd(), 'practice_words.xlsx')),
                 'practice_audio_dir': os.path.abspath(os.path.join(os.getcwd(), 'practice_audio'))
+            },
+            # 오디오 스트림 지연 설정 (profile: 'default'는 장치 기본값, 'low'는 검증된 장비에서만)
+            # 장비별로 blocksize(0이면 장치 기본값)/latency('low'/'high' 또는 초)를 직접 지정할 수도 있음
+            # output_samplerate: 자극을 변환할 출력 샘플링 레이트 (0이면 출력 장치 기본값)
+            'audio': {
+                'profile': 'default',
+                'dtype': 'float32',
+                'output_samplerate': 0,
+                'resample_cache_dir': os.path.abspath(os.path.join(os.getcwd(), 'resampled_stimuli'))
             }
         }
         self.config = self.load_config()
@@ -95,6 +104,9 @@ class ConfigManager:
                 for key, value in self.default_config['paths'].items():
                     if key not in config['paths'] or not config['paths'][key]:
                         config['paths'][key] = value
+                
+                # 기본 오디오 지연 설정
+                config['audio'] = {**self.default_config['audio'], **config.get('audio', {})}
                         
                 return config
             else:
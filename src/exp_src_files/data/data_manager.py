@@ -1,7 +1,7 @@
 import pandas as pd
 import os
 from datetime import datetime
-import sounddevice as sd
+from audio.device_registry import get_registry
 
 class DataManager:
     @staticmethod
@@ -15,7 +15,11 @@ class DataManager:
         # 열 순서 정렬
         columns_order = [
             '참가자번호', '단계', '단어', '음성파일', 
-            '시작시간', '스페이스바_시간'
+            '시작시간', '스페이스바_시간',
+            '시작_단조시각', '스페이스바_단조시각', '시작_스트림시각', '스페이스바_스트림시각',
+            '시작_샘플', '자극종료_샘플', '스페이스바_샘플',
+            '평균레벨_dBFS', '최대레벨_dBFS', '클리핑_샘플수',
+            '재생시작지연_ms', '자극_DAC시작', '자극_DAC종료', '출력시계_오프셋_초'
         ]
         # 존재하는 열만 선택
         existing_columns = [col for col in columns_order if col in df.columns]
@@ -57,7 +61,7 @@ class DataManager:
                 info_df = pd.DataFrame({
                     '참가자번호': [participant_id],
                     '실험일시': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-                    '녹음장치': [sd.query_devices(selected_device)['name']],
+                    **{key: [value] for key, value in get_registry().info_columns(selected_device).items()},
                     '실험 리스트': [selected_lists]
                 })
                 info_df.to_excel(writer, sheet_name='Info', index=False)
@@ -77,10 +81,38 @@ class DataManager:
             '성별': participant_info['gender'],
             '나이': participant_info['age'],
             '실험일시': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-            '녹음장치': [sd.query_devices(selected_device)['name']],
+            **{key: [value] for key, value in get_registry().info_columns(selected_device).items()},
             '실험 리스트': [selected_lists]
         })
         
         excel_path = os.path.join(participant_folder, f"{participant_id}_experiment_data.xlsx")
         with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
             info_df.to_excel(writer, sheet_name='Info', index=False)
+
+    @staticmethod
+    def update_info(participant_id, folder_path, values):
+        """
+        Excel 파일의 Info 시트에 열을 추가하거나 갱신합니다. (다른 시트는 그대로 유지)
+
+        Args:
+            participant_id (str): 참가자 번호
+            folder_path (str): 참가자 폴더 경로
+            values (dict): {열 이름: 값}
+        """
+        excel_path = os.path.join(folder_path, f"{participant_id}_experiment_data.xlsx")
+        if not values or not os.path.exists(excel_path):
+            return
+        
+        with pd.ExcelFile(excel_path) as xls:
+            sheets = {sheet_name: pd.read_excel(xls, sheet_name=sheet_name) for sheet_name in xls.sheet_names}
+        
+        info_df = sheets.get('Info', pd.DataFrame({'참가자번호': [participant_id]}))
+        for column, value in values.items():
+            info_df[column] = value
+        sheets['Info'] = info_df
+        
+        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+            info_df.to_excel(writer, sheet_name='Info', index=False)
+            for sheet_name, sheet_data in sheets.items():
+                if sheet_name != 'Info':
+                    sheet_data.to_excel(writer, sheet_name=sheet_name, index=False)
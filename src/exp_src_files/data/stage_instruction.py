@@ -1,7 +1,6 @@
 import pandas as pd
 import os
 import datetime
-import sounddevice as sd
 
 class StageInstruction:
     @staticmethod
@@ -5,7 +5,6 @@ import pandas as pd
 import time
 from datetime import datetime
 import random
-import sounddevice as sd
 import scipy.io.wavfile as wav
 import numpy as np
 import threading
@@ -13,6 +12,7 @@ import glob
 import soundfile as sf
 from config import ConfigManager, ConfigWindow
 from audio import AudioConstants, AudioRecorder, AudioDeviceWindow, AudioPlayer
+from audio.device_registry import get_registry
 from ui import ParticipantInfoWindow, AudioPlaybackWindow, MainExperimentWindow, ListSelectionWindow, WordPresentationWindow
 from data import DataManager, StageInstruction
 import sys
@@ -70,7 +70,7 @@ def check_existing_data(participant_id, base_dir, selected_device=None, selected
                                     '성별': [participant_info['gender'] if participant_info else ''],
                                     '나이': [participant_info['age'] if participant_info else ''],
                                     '실험일시': [current_time.strftime('%Y-%m-%d %H:%M:%S')],
-                                    '녹음장치': [sd.query_devices(selected_device)['name'] if selected_device else ''],
+                                    **{key: [value] for key, value in get_registry().info_columns(selected_device).items()},
                                     '실험 리스트': [selected_lists if selected_lists else '']
                                 })
                                 info_df.to_excel(writer, sheet_name='Info', index=False)
@@ -127,7 +127,7 @@ def check_existing_data(participant_id, base_dir, selected_device=None, selected
                                 '성별': [participant_info['gender'] if participant_info else ''],
                                 '나이': [participant_info['age'] if participant_info else ''],
                                 '실험일시': [current_time.strftime('%Y-%m-%d %H:%M:%S')],
-                                '녹음장치': [sd.query_devices(selected_device)['name'] if selected_device else ''],
+                                **{key: [value] for key, value in get_registry().info_columns(selected_device).items()},
                                 '실험 리스트': [selected_lists if selected_lists else '']
                             })
                             info_df.to_excel(writer, sheet_name='Info', index=False)
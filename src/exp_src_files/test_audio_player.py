@@ -0,0 +1,34 @@
+import time
+import numpy as np
+import soundfile as sf
+from audio.audio_player import AudioPlayer
+from audio.backend import SimulatedBackend
+
+SR = 16000
+
+def _write_tone(path, seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    sf.write(path, (0.2 * np.sin(2 * np.pi * 440 * t)).astype(np.float32), SR)
+    return str(path)
+
+def test_stop_during_playback_keeps_stream_running(tmp_path):
+    long_file = _write_tone(tmp_path / 'long.wav', 2.0)
+    short_file = _write_tone(tmp_path / 'short.wav', 0.05)
+    backend = SimulatedBackend(samplerate=SR, speed=50.0, default_blocksize=64)
+    player = AudioPlayer(str(tmp_path), latency_profile={'blocksize': 64}, backend=backend)
+    try:
+        # 콜백이 자극을 꺼내는 도중에 stop()이 대기열을 비우는 상황을 반복
+        for _ in range(200):
+            items = [player.queue_stimulus(long_file) for _ in range(3)]
+            time.sleep(0.0005)
+            player.stop()
+            assert all(item.done.wait(1.0) for item in items)
+            assert player.stream.active
+
+        assert not player.is_playing()
+        item = player.queue_stimulus(short_file)
+        assert item.done.wait(2.0)
+        assert item.dac_onset is not None and item.dac_offset is not None
+        assert player.stream.active
+    finally:
+        player.close()
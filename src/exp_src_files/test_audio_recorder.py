@@ -0,0 +1,84 @@
+import os
+import time
+import numpy as np
+import soundfile as sf
+from audio import AudioConstants
+from audio.audio_recorder import AudioRecorder, SFC_UPDATE_HEADER_NOW
+from audio.backend import SimulatedBackend
+
+def _recorder(tmp_path, seconds=1.0, speed=20.0, blocksize=256):
+    samplerate = AudioConstants.SAMPLE_RATE
+    signal = 0.1 * np.sin(2 * np.pi * 220 * np.arange(int(seconds * samplerate)) / samplerate)
+    backend = SimulatedBackend(signal.astype(np.float32), samplerate=samplerate, speed=speed, loop_input=False)
+    return AudioRecorder(0, str(tmp_path), header_interval=0.05, latency_profile={'blocksize': blocksize},
+                         backend=backend)
+
+def _wait_for_frames(recorder, frames, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while recorder.frames_captured < frames and time.perf_counter() < deadline:
+        time.sleep(0.005)
+
+def test_header_sync_failure_is_logged_once_and_disabled(tmp_path, monkeypatch):
+    recorder = _recorder(tmp_path)
+    calls = []
+
+    class BrokenCommand:
+        # 헤더 갱신 명령만 실패하고 나머지 libsndfile 호출은 그대로 사용
+        def __init__(self, snd):
+            self._real = snd
+
+        def __getattr__(self, name):
+            return getattr(self._real, name)
+
+        def sf_command(self, sndfile, command, *args):
+            if command != SFC_UPDATE_HEADER_NOW:
+                return self._real.sf_command(sndfile, command, *args)
+            calls.append(command)
+            raise RuntimeError('sf_command unavailable')
+
+    monkeypatch.setattr(sf, '_snd', BrokenCommand(sf._snd))
+    recorder.start_recording('1_stage1')
+    recorder.stream.finished.wait(2.0)
+    recorder.stop_recording()
+
+    assert len(calls) == 1
+    assert not recorder.header_sync
+    assert recorder.write_error is None
+    assert os.path.exists(recorder.filename)
+
+def test_write_error_keeps_partial_file(tmp_path):
+    recorder = _recorder(tmp_path)
+    recorder.start_recording('1_stage1')
+    _wait_for_frames(recorder, 4096)
+    recorder.add_marker('onset', 1, '단어')
+
+    def broken_write(block):
+        raise OSError('disk full')
+
+    recorder.sound_file.write = broken_write
+    recorder.stream.finished.wait(2.0)
+    recorder.stop_recording()
+
+    assert isinstance(recorder.write_error, OSError)
+    assert recorder.sound_file is None
+    assert not os.path.exists(recorder.filename)
+    assert os.path.exists(recorder.partial_filename)
+    assert os.path.exists(recorder.filename[:-len('.wav')] + '.markers.npz')
+
+def test_marker_before_first_callback_is_deferred(tmp_path):
+    # 실제 속도에서 블록이 커서 첫 콜백까지 약 0.1초가 걸림
+    recorder = _recorder(tmp_path, seconds=0.5, speed=1.0, blocksize=4096)
+    recorder.start_recording('1_stage1')
+    at_time = recorder.stream.time
+    assert recorder.time_to_sample(at_time) is None
+    assert recorder.add_marker('onset', 1, '단어', at_time=at_time) is None
+    assert recorder.markers == []
+
+    _wait_for_frames(recorder, 4096)
+    later = recorder.add_marker('space', 1, '단어')
+    recorder.stream.finished.wait(2.0)
+    recorder.stop_recording()
+
+    markers = np.load(recorder.filename[:-len('.wav')] + '.markers.npz')
+    assert list(markers['kind']) == ['onset', 'space']
+    assert 0 <= markers['sample'][0] < later
@@ -1,9 +1,8 @@
 import tkinter as tk
-import time
 import os
 from datetime import datetime
 from audio import AudioPlayer
-import sounddevice as sd
+from audio.backend import get_backend
 
 
 class AudioPlaybackWindow:
@@ -59,19 +58,9 @@ class AudioPlaybackWindow:
             self.instruction_label.config(text=message)
             self.window.update()
             
-            # 오디오 재생
-            duration = self.player.play_audio(audio_file)
-            
-            # 오디오 재생이 끝날 때까지 대기
-            while self.player.is_playing():
-                time.sleep(0.1)
-            
-            # 오디오 재생이 끝나면 두 번째 메시지 표시
-            self.instruction_label.config(text='소리내어 따라하신 후, 스페이스바를 눌러 다음으로 넘어가세요.')
-            self.window.update()
-            
-            # 타이밍 데이터에 음성 파일과 시작 시간 기록
-            self.timing_data.append({
+            # 오디오 재생 (종료는 after()로 확인해 UI가 멈추지 않게 함)
+            self.player.play_audio(audio_file)
+            self.watch_playback(self.player.last_stimulus, {
                 '음성파일': self.current_file,
                 '시작시간': current_time,
                 '단계': self.current_stage,
@@ -87,7 +76,7 @@ class AudioPlaybackWindow:
                     self.recorder.stop_recording()
             
             if self.player:
-                sd.stop()
+                self.player.close()
             
             self.instruction_label.config(text='')
             self.window.update()
@@ -98,12 +87,26 @@ class AudioPlaybackWindow:
             else:
                 self.show_experiment_completion()
 
+    def watch_playback(self, item, trial_data, interval_ms=10):
+        """자극 재생이 끝났는지 after()로 확인하고, 끝나면 안내를 바꾸고 타이밍 데이터를 기록합니다."""
+        if not self.player.has_finished(item):
+            self.window.after(interval_ms, self.watch_playback, item, trial_data, interval_ms)
+            return
+        
+        # 오디오 재생이 끝나면 두 번째 메시지 표시
+        self.instruction_label.config(text='소리내어 따라하신 후, 스페이스바를 눌러 다음으로 넘어가세요.')
+        
+        # 타이밍 데이터에 음성 파일과 시작 시간 기록
+        self.timing_data.append(trial_data)
+
     def close_window(self, event):
         if not self.remaining_files:
             self.on_closing()
         
     def on_closing(self):
-        sd.stop()  # 재생 중인 오디오 정지
+        if self.player:
+            self.player.close()  # 출력 스트림 닫기
+        get_backend().stop()  # 재생 중인 오디오 정지
         self.window.quit()
         
     def show(self):
@@ -2,12 +2,14 @@ import tkinter as tk
 import os
 from datetime import datetime
 import time
-from audio import AudioPlayer, AudioRecorder
+from audio import AudioConstants, AudioPlayer, AudioRecorder, StimulusCache
+from audio.device_registry import get_registry
+from audio.stimulus_resampler import ResampleCache
 import random
 import pandas as pd
 from data import DataManager, StageInstruction
 from tkinter import messagebox
-import sounddevice as sd
+from audio.backend import get_backend
 
 class MainExperimentWindow:
     def __init__(self, config):
@@ -72,6 +74,18 @@ class MainExperimentWindow:
         self.instruction_label = tk.Label(self.center_frame, text='', font=('Arial', self.small_font_size))
         self.instruction_label.pack(pady=30)  # 여백 증가
         
+        # 입력 레벨 표시 (오른쪽 아래, 실험자 확인용)
+        self.level_label = tk.Label(self.window, text='', font=('Arial', 12), fg='gray')
+        self.level_label.place(relx=0.99, rely=0.99, anchor='se')
+        self.level_mark = None
+        # 재생이 끝나 finish_playback이 호출되기 전까지의 자극
+        self.playback_item = None
+        # 재생 스트림 시각 -> 녹음 스트림 시각 오프셋 (스트림을 열 때마다 측정)
+        self.output_clock_offset = None
+        self.offset_stream = None
+        # 3~5단계 자극 디코딩이 끝났는지 (끝나기 전에는 스페이스바로 재생하지 않음)
+        self.stimuli_ready = False
+        
         self.current_stage = 0
         self.timing_data = []
         
@@ -229,12 +243,52 @@ class MainExperimentWindow:
             selected_lists
         )
         
-        self.player = AudioPlayer(self.folder_path)
-        self.recorder = AudioRecorder(selected_device, folder_path)
+        latency_profile = self.config.get('audio')
+        # 자극 음성은 단계 안내 화면에서 미리 디코딩하고 출력 샘플링 레이트로 변환해 메모리에서 재생
+        audio_config = latency_profile or {}
+        self.stimulus_cache = StimulusCache(
+            dtype=AudioConstants.latency_profile(latency_profile)['dtype'],
+            samplerate=self.get_output_samplerate(),
+            resampler=ResampleCache(audio_config['resample_cache_dir']) if audio_config.get('resample_cache_dir') else None
+        )
+        self.player = AudioPlayer(self.folder_path, latency_profile=latency_profile, cache=self.stimulus_cache)
+        self.recorder = AudioRecorder(selected_device, folder_path, latency_profile=latency_profile)
+        self.reported_latency = {}
+        
+        # 입력 레벨 표시 시작
+        self.update_level_display()
         
         # 전체 실험 설명 표시
         self.show_experiment_intro()
 
+    def get_output_samplerate(self):
+        """자극을 변환할 출력 샘플링 레이트 (config 값이 0이면 기본 출력 장치의 기본값)"""
+        samplerate = (self.config.get('audio') or {}).get('output_samplerate')
+        if samplerate:
+            return int(samplerate)
+        registry = get_registry()
+        device = registry.get(registry.default_output) if registry.default_output is not None else None
+        if device and device['default_samplerate']:
+            return int(device['default_samplerate'])
+        return AudioConstants.SAMPLE_RATE
+
+    def update_level_display(self, interval_ms=100):
+        """녹음기의 입력 레벨을 주기적으로 읽어 표시합니다. (낮으면 주황색, 클리핑은 빨간색)"""
+        if not self.level_label.winfo_exists():
+            return
+        if self.recorder and self.recorder.recording:
+            rms_db, peak_db, clips = self.recorder.level_meter.current()
+            if clips:
+                color = 'red'
+            elif rms_db < -55:
+                color = 'orange'
+            else:
+                color = 'gray'
+            self.level_label.config(text=f'입력 {rms_db:.0f} dBFS / 피크 {peak_db:.0f} dBFS', fg=color)
+        else:
+            self.level_label.config(text='')
+        self.window.after(interval_ms, self.update_level_display)
+
     def save_current_stage_data(self):
         """현재 단계의 데이터를 저장합니다."""
         DataManager.save_stage_data(
@@ -245,6 +299,53 @@ class MainExperimentWindow:
             self.selected_device,
             self.selected_lists
         )
+        self.report_stream_latency()
+
+    def report_stream_latency(self):
+        """녹음/재생 스트림에서 협상된 지연 값을 Info 시트에 기록합니다. (값이 바뀐 경우만)"""
+        values = {
+            '지연프로필': self.recorder.latency_profile['profile'],
+            '지연설정': str(self.recorder.latency_profile['latency']),
+            '샘플형식': self.recorder.latency_profile['dtype'],
+        }
+        if self.recorder.stream_info:
+            values['입력지연_초'] = round(self.recorder.stream_info['latency'], 4)
+            values['입력_블록크기'] = self.recorder.stream_info['blocksize']
+        if self.player.stream_info:
+            values['출력지연_초'] = round(self.player.stream_info['latency'], 4)
+            values['출력_블록크기'] = self.player.stream_info['blocksize']
+        
+        if values != self.reported_latency:
+            try:
+                DataManager.update_info(self.participant_id, self.folder_path, values)
+                self.reported_latency = values
+            except Exception as e:
+                print(f"지연 정보 저장 오류: {str(e)}")
+
+    def report_dropped_input(self):
+        """
+        단계 녹음에서 버려진 입력(장치 오버플로, 링 버퍼 오버플로) 통계를 Info 시트에 기록합니다.
+
+        녹음을 멈춘 뒤 호출하며, 단계별 열('{단계}단계_입력오버플로' 등)로 저장하므로 나중에
+        녹음 파일이 손상되었는지 단계마다 확인할 수 있습니다.
+        """
+        counts = self.recorder.get_overflow_counts()
+        prefix = f'{self.current_stage}단계_'
+        values = {
+            prefix + '입력오버플로': counts['input_overflows'],
+            prefix + '상태플래그': counts['status_errors'],
+            prefix + '버퍼오버플로': counts['buffer_overflows'],
+            prefix + '버린프레임': counts['dropped_frames'],
+        }
+        if self.recorder.write_error is not None:
+            values[prefix + '기록오류'] = str(self.recorder.write_error)
+        if counts['input_overflows'] or counts['buffer_overflows']:
+            print(f"{self.current_stage}단계 녹음 입력 손실: 입력 오버플로 {counts['input_overflows']}회, "
+                  f"버퍼 오버플로 {counts['buffer_overflows']}회 ({counts['dropped_frames']} 프레임)")
+        try:
+            DataManager.update_info(self.participant_id, self.folder_path, values)
+        except Exception as e:
+            print(f"녹음 상태 저장 오류: {str(e)}")
 
     def show_stage_instruction(self, stage_number):
         """각 단계별 안내 창을 표시합니다."""
@@ -263,6 +364,10 @@ class MainExperimentWindow:
         )
         instruction_text.pack(expand=True, padx=20, pady=20)
         
+        # 안내를 읽는 동안 자극 음성을 백그라운드에서 디코딩
+        if stage_number in [3, 4, 5]:
+            self.stimulus_cache.preload_async(self.list_audio_files(self.get_audio_dir(stage_number)))
+        
         start_button = tk.Button(
             instruction_frame,
             text="시작하기",
@@ -275,10 +380,16 @@ class MainExperimentWindow:
 
     def handle_space_press(self, event):
         """스페이스바 이벤트 핸들러"""
+        # 단조 시계와 오디오 스트림 시계를 핸들러 진입 시점에 함께 기록
+        press_clock = time.perf_counter()
+        press_stream_time = self.recorder.stream_time() if self.recorder else None
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
         
-        # 음성 재생 중에는 스페이스바 입력 무시
-        if hasattr(self, 'player') and self.player.is_playing():
+        # 음성 재생 중(종료 처리 전 포함)에는 스페이스바 입력 무시
+        if self.playback_item is not None or (hasattr(self, 'player') and self.player.is_playing()):
+            return
+        # 자극을 아직 디코딩하는 중이면 무시 (wait_for_stimuli가 준비되면 안내를 바꿈)
+        if self.current_stage in [3, 4, 5] and not self.stimuli_ready:
             return
             
         # 이미 스페이스바가 눌린 상태라면 무시
@@ -290,6 +401,17 @@ class MainExperimentWindow:
         # 모든 단계에서 스페이스바 시간 기록
         if self.timing_data:
             self.timing_data[-1]['스페이스바_시간'] = current_time
+            self.timing_data[-1]['스페이스바_단조시각'] = press_clock
+            self.timing_data[-1]['스페이스바_스트림시각'] = press_stream_time
+            # 녹음 파일 기준 샘플 위치도 마커로 기록
+            trial = self.timing_data[-1]
+            self.timing_data[-1]['스페이스바_샘플'] = self.recorder.add_marker(
+                'space', len(self.timing_data), trial.get('단어', trial.get('음성파일', '')),
+                at_time=press_stream_time)
+            # 시행 구간(제시 또는 자극 종료 ~ 스페이스바)의 입력 레벨 통계
+            if self.level_mark is not None:
+                self.timing_data[-1].update(self.recorder.level_meter.stats_since(self.level_mark))
+                self.level_mark = None
             
         if self.current_stage in [1, 2, 6]:  # 1단계, 1단계 반복, 4단계
             self.show_next_word()
@@ -321,7 +443,8 @@ class MainExperimentWindow:
         
         # 녹음기 초기화 확인
         if not hasattr(self, 'recorder') or not self.recorder:
-            self.recorder = AudioRecorder(self.selected_device, self.folder_path)
+            self.recorder = AudioRecorder(self.selected_device, self.folder_path,
+                                          latency_profile=self.config.get('audio'))
             
         # 모든 단계에서 녹음 시작
         self.recorder.start_recording(f"{self.participant_id}_stage{self.current_stage}")
@@ -338,8 +461,12 @@ class MainExperimentWindow:
             
         elif self.current_stage in [3, 4, 5]:  # 2단계와 2단계 반복
             self.main_label.config(text='음성을 듣고 따라 읽어주세요')
-            self.instruction_label.config(text='스페이스바를 눌러 시작하세요')
+            self.stimuli_ready = False
             self.load_audio_files()
+            # 재생 스트림을 미리 열고 녹음 스트림과의 시계 차이를 잼
+            self.player.open_stream(self.stimulus_cache.samplerate)
+            self.sync_output_clock()
+            self.wait_for_stimuli()
             
         elif self.current_stage == 6:  # 4단계
             self.main_label.config(text='단어를 소리내어 읽어주세요')
@@ -391,14 +518,22 @@ class MainExperimentWindow:
             self.instruction_label.config(text='단어를 소리내어 읽어주신 후 스페이스바를 눌러 다음 단어로 넘어가세요.')
             self.current_word_index += 1
             self.start_time = time.time()
+            onset_clock = time.perf_counter()
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
             
             if self.current_stage in [1, 2, 6]:  # 1단계, 1단계 반복, 4단계
                 self.recorder.start_recording(f"{self.participant_id}_stage{self.current_stage}")
+                onset_stream_time = self.recorder.stream_time()
+                onset_sample = self.recorder.add_marker('onset', len(self.timing_data) + 1, word,
+                                                        at_time=onset_stream_time)
+                self.level_mark = self.recorder.level_meter.mark()
                 # 타이밍 데이터에 단어와 시작 시간 기록
                 self.timing_data.append({
                     '단어': word,
                     '시작시간': current_time,
+                    '시작_단조시각': onset_clock,
+                    '시작_스트림시각': onset_stream_time,
+                    '시작_샘플': onset_sample,
                     '단계': self.current_stage,
                     '참가자번호': self.participant_id,
                     '선택된_리스트': self.selected_lists
@@ -408,6 +543,7 @@ class MainExperimentWindow:
             
             if self.recorder:
                 self.recorder.stop_recording()
+                self.report_dropped_input()
             
             self.main_label.config(text='')
             self.instruction_label.config(text='')
@@ -445,25 +581,19 @@ class MainExperimentWindow:
             self.instruction_label.config(text='')
             self.window.update()
             
-            # 오디오 재생
+            # 오디오 재생 (종료는 after()로 확인해 UI가 멈추지 않게 함)
+            trial = len(self.timing_data) + 1
             duration = self.player.play_audio(audio_file)
-            
-            # 오디오 재생이 끝날 때까지 대기
-            while self.player.is_playing():
-                time.sleep(0.1)
-            
-            # 오디오 재생이 끝나면 두 번째 메시지 표시
-            self.instruction_label.config(text='소리내어 따라하신 후, 스페이스바를 눌러 다음으로 넘어가세요.')
-            self.window.update()
-            
-            # 타이밍 데이터에 음성 파일과 시작 시간 기록
-            self.timing_data.append({
+            item = self.player.last_stimulus if duration else None
+            self.sync_output_clock()  # 샘플링 레이트가 달라 스트림을 다시 연 경우
+            self.playback_item = item
+            self.watch_playback(item, {
                 '음성파일': self.current_file,
                 '시작시간': current_time,
                 '단계': self.current_stage,
                 '참가자번호': self.participant_id,
                 '선택된_리스트': current_list
-            })
+            }, trial)
         else:
             self.save_current_stage_data()
             
@@ -471,9 +601,11 @@ class MainExperimentWindow:
             if self.current_stage in [3, 4, 5]:
                 if hasattr(self, 'recorder') and self.recorder:
                     self.recorder.stop_recording()
+                    self.report_dropped_input()
             
+            # 단계 동안 열어 둔 출력 스트림 닫기
             if self.player:
-                sd.stop()
+                self.player.close()
             
             self.main_label.config(text='')
             self.instruction_label.config(text='')
@@ -486,8 +618,94 @@ class MainExperimentWindow:
             else:
                 self.show_experiment_completion()
 
+    def wait_for_stimuli(self, interval_ms=50):
+        """
+        자극 디코딩이 끝났는지 after()로 확인하고, 끝나면 스페이스바 안내를 표시합니다.
+
+        안내 화면에서 시작한 백그라운드 디코딩을 UI 스레드에서 기다리지 않으므로 창이 멈추지 않습니다.
+
+        Args:
+            interval_ms (int): 확인 간격 (밀리초)
+        """
+        if self.stimulus_cache.wait(timeout=0):
+            self.stimuli_ready = True
+            self.instruction_label.config(text='스페이스바를 눌러 시작하세요')
+        else:
+            self.instruction_label.config(text='음성 파일을 준비하고 있습니다...')
+            self.window.after(interval_ms, self.wait_for_stimuli, interval_ms)
+
+    def watch_playback(self, item, trial_data, trial, interval_ms=10):
+        """
+        자극 재생이 끝났는지 after()로 확인하고, 끝나면 finish_playback을 호출합니다.
+
+        Args:
+            item (Stimulus): 재생 중인 자극 (재생 실패 시 None)
+            trial_data (dict): 이 시행의 타이밍 데이터
+            trial (int): 시행 번호
+            interval_ms (int): 확인 간격 (밀리초)
+        """
+        if self.player.has_finished(item):
+            self.finish_playback(item, trial_data, trial)
+        else:
+            self.window.after(interval_ms, self.watch_playback, item, trial_data, trial, interval_ms)
+
+    def sync_output_clock(self):
+        """
+        재생 스트림 시각을 녹음 스트림 시각으로 바꾸는 오프셋을 잽니다.
+
+        두 스트림의 시계는 기준점이 다를 수 있으므로(PortAudio는 단조 증가만 보장)
+        재생 스트림이 새로 열렸을 때만 다시 측정합니다.
+        """
+        stream = self.player.stream
+        if stream is None or stream is self.offset_stream:
+            return
+        self.output_clock_offset = self.recorder.measure_clock_offset(stream)
+        self.offset_stream = stream
+
+    def output_to_input_time(self, stream_time):
+        """재생 스트림 시각을 녹음 스트림 시각으로 바꿉니다. (오프셋을 모르면 None)"""
+        if stream_time is None or self.output_clock_offset is None:
+            return None
+        return stream_time + self.output_clock_offset
+
+    def finish_playback(self, item, trial_data, trial):
+        """자극 재생이 끝나면 마커와 타이밍 데이터를 기록하고 따라하기 안내를 표시합니다."""
+        self.playback_item = None
+        # 시작/종료 마커는 재생 스트림이 보고한 DAC 시각을 녹음 스트림 시각으로 바꿔 찍음
+        dac_onset = item.dac_onset if item is not None else None
+        dac_offset = item.dac_offset if item is not None else None
+        onset_input_time = self.output_to_input_time(dac_onset)
+        end_input_time = self.output_to_input_time(dac_offset)
+        onset_sample = self.recorder.add_marker('onset', trial, self.current_file,
+                                                at_time=onset_input_time) if onset_input_time is not None else None
+        end_sample = self.recorder.add_marker('stimulus_end', trial, self.current_file,
+                                              at_time=end_input_time) if end_input_time is not None else None
+        onset_latency = item.onset_latency if item is not None else None
+        self.level_mark = self.recorder.level_meter.mark()
+        # 시각 열은 열마다 한 시계만 사용:
+        # 스트림시각은 스페이스바와 같은 녹음 스트림 시계로 바꾼 DAC 시작 시각,
+        # 단조시각은 자극을 대기열에 넣은 perf_counter 시각 (DAC 시작보다 재생시작지연만큼 이름)
+        trial_data['시작_스트림시각'] = onset_input_time
+        trial_data['시작_단조시각'] = item.queued_clock if item is not None else None
+        
+        # 오디오 재생이 끝나면 두 번째 메시지 표시
+        self.instruction_label.config(text='소리내어 따라하신 후, 스페이스바를 눌러 다음으로 넘어가세요.')
+        
+        # 타이밍 데이터에 음성 파일과 시작 시간 기록
+        trial_data.update({
+            '시작_샘플': onset_sample,
+            '자극종료_샘플': end_sample,
+            '재생시작지연_ms': round(onset_latency * 1000, 2) if onset_latency is not None else None,
+            '자극_DAC시작': round(dac_onset, 6) if dac_onset is not None else None,
+            '자극_DAC종료': round(dac_offset, 6) if dac_offset is not None else None,
+            '출력시계_오프셋_초': round(self.output_clock_offset, 6) if self.output_clock_offset is not None else None,
+        })
+        self.timing_data.append(trial_data)
+
     def on_closing(self):
-        sd.stop()  # 재생 중인 오디오 정지
+        if hasattr(self, 'player') and self.player:
+            self.player.close()  # 출력 스트림 닫기
+        get_backend().stop()  # 재생 중인 오디오 정지
         self.window.quit()
 
     def load_words(self):
@@ -504,20 +722,31 @@ class MainExperimentWindow:
             messagebox.showerror("오류", f"단어 목록을 불러오는데 실패했습니다: {str(e)}")
             return []
 
+    def get_audio_dir(self, stage_number):
+        """단계별 자극 음성 디렉토리 (3단계는 practice_audio_dir, 4-5단계는 audio_sample_dir)"""
+        key = 'practice_audio_dir' if stage_number == 3 else 'audio_sample_dir'
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), self.config['paths'][key])
+
+    def list_audio_files(self, audio_dir):
+        """디렉토리의 자극 음성 파일 목록"""
+        if not os.path.exists(audio_dir):
+            return []
+        return [os.path.join(audio_dir, f) for f in os.listdir(audio_dir)
+                if f.endswith('.wav') and not f.startswith('._')]
+
     def load_audio_files(self):
         """오디오 파일 목록을 로드합니다."""
         self.remaining_files = []
         
-        # 3단계는 practice_audio_dir, 4단계는 audio_sample_dir 사용
-        if self.current_stage == 3:
-            audio_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.config['paths']['practice_audio_dir'])
-        else:  # 4단계
-            audio_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.config['paths']['audio_sample_dir'])
+        audio_dir = self.get_audio_dir(self.current_stage)
         
         if os.path.exists(audio_dir):
             # 원본 오디오 파일 목록 가져오기
-            audio_files = [os.path.join(audio_dir, f) for f in os.listdir(audio_dir) 
-                         if f.endswith('.wav') and not f.startswith('._')]
+            audio_files = self.list_audio_files(audio_dir)
+            
+            # 안내 화면에서 시작한 디코딩에 이어서 빠진 파일만 백그라운드로 디코딩
+            # (완료는 initialize_stage의 wait_for_stimuli가 after()로 확인)
+            self.stimulus_cache.preload_async(audio_files)
             
             # 3개의 리스트 생성
             list1 = audio_files.copy()
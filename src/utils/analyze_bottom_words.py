@@ -1,20 +1,17 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from frequency_table import bottom_n_words
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
 plt.rcParams['axes.unicode_minus'] = False
 
-def analyze_bottom_words(input_file='word_frequency.xlsx', n_words=100):
+def analyze_bottom_words(input_file='word_frequency.parquet', n_words=100):
     """하위 빈도 단어를 분석하고 시각화합니다."""
     print(f"\n=== 하위 {n_words}개 단어 분석 시작 ===")
     
-    # 엑셀 파일 읽기
-    df = pd.read_excel(input_file)
-    
-    # 하위 n개 단어 추출
-    bottom_df = df.tail(n_words).iloc[::-1]  # 역순으로 정렬
+    # 기준 빈도표에서 하위 n개 단어 추출 (빈도 오름차순)
+    bottom_df = bottom_n_words(input_file, n_words)
     
     # 결과 저장
     output_prefix = 'bottom_words'
@@ -44,4 +41,4 @@ def analyze_bottom_words(input_file='word_frequency.xlsx', n_words=100):
     return bottom_df
 
 if __name__ == "__main__":
-    bottom_df = analyze_bottom_words('word_frequency.xlsx', 100) 
\ No newline at end of file
+    bottom_df = analyze_bottom_words('word_frequency.parquet', 100) 
\ No newline at end of file
@@ -1,12 +1,18 @@
 import os
 import json
+import hashlib
+from multiprocessing import Pool
 import pandas as pd
 import matplotlib.pyplot as plt
 from collections import Counter
+from itertools import islice
 from konlpy.tag import Okt
 import seaborn as sns
 import numpy as np
 from tqdm import tqdm
+import ijson
+from frequency_table import (load_frequency_table, save_frequency_table, export_xlsx_streaming,
+                             top_n_words, bottom_n_words)
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -21,28 +27,67 @@ def get_all_files(corpus_dir):
                 json_files.append(os.path.join(root, file))
     return json_files
 
-def extract_text_from_json(file_path):
+def iter_utterance_forms(file_path, stats=None):
+    """
+    JSON 파일을 점진적으로 파싱하면서 document[].utterance[].form 문자열을 순서대로 반환합니다.
+    
+    ijson으로 파일 전체를 메모리에 올리지 않고 읽습니다. (config/requirements.txt)
+    
+    Args:
+        file_path (str): JSON 파일 경로
+        stats (dict, optional): 전달되면 'documents' 키에 document 개수를 기록
+    """
+    n_documents = 0
+    with open(file_path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == 'document.item' and event == 'start_map':
+                n_documents += 1
+            elif prefix == 'document.item.utterance.item.form' and event == 'string':
+                yield value
+    if stats is not None:
+        stats['documents'] = n_documents
+
+def extract_text_from_json(file_path, verbose=False):
     """JSON 파일에서 대화 텍스트를 추출합니다."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        text = ""
-        # document 배열의 모든 요소 확인
-        if 'document' in data and isinstance(data['document'], list):
-            for doc in data['document']:
-                if 'utterance' in doc:
-                    for utterance in doc['utterance']:
-                        if isinstance(utterance, dict) and 'form' in utterance:
-                            text += utterance['form'] + " "
-                            
-            # document가 비어있는 경우 로그 출력
-            if len(data['document']) == 0:
-                print(f"\nWarning: Empty document array in {os.path.basename(file_path)}")
-            # document가 여러 개인 경우 로그 출력
-            elif len(data['document']) > 1:
-                print(f"\nInfo: Multiple documents ({len(data['document'])}) found in {os.path.basename(file_path)}")
+    stats = {}
+    text = " ".join(iter_utterance_forms(file_path, stats))
+    
+    if verbose:
+        # document가 비어있는 경우 로그 출력
+        if stats['documents'] == 0:
+            print(f"\nWarning: Empty document array in {os.path.basename(file_path)}")
+        # document가 여러 개인 경우 로그 출력
+        elif stats['documents'] > 1:
+            print(f"\nInfo: Multiple documents ({stats['documents']}) found in {os.path.basename(file_path)}")
     return text.strip()
 
-def analyze_corpus(corpus_dir):
+# 추출 범주별 Okt 품사 태그 (태그 접두어로 비교)
+POS_CATEGORIES = {
+    'nouns': ('Noun',),
+    'verbs': ('Verb',),
+    'adjectives': ('Adjective',),
+    'stems': ('Verb', 'Adjective'),  # 용언 원형 (stem=True로 태깅)
+}
+DEFAULT_CATEGORIES = ('nouns', 'verbs')
+
+def extract_words(okt, text, categories=DEFAULT_CATEGORIES, min_length=2):
+    """
+    한 번의 품사 태깅 결과에서 지정한 범주의 단어를 추출합니다.
+    
+    Args:
+        okt (Okt): 형태소 분석기
+        text (str): 분석할 텍스트
+        categories (tuple): POS_CATEGORIES의 키. 'stems'가 포함되면 용언을 원형으로 태깅
+        min_length (int): 최소 글자 수
+    
+    Returns:
+        list: 추출된 단어 리스트
+    """
+    tags = tuple(tag for category in categories for tag in POS_CATEGORIES[category])
+    tagged = okt.pos(text, stem='stems' in categories)
+    return [word for word, pos in tagged if pos.startswith(tags) and len(word) >= min_length]
+
+def analyze_corpus(corpus_dir, categories=DEFAULT_CATEGORIES):
     # Okt 형태소 분석기 초기화
     print("형태소 분석기 초기화 중...")
     okt = Okt()
@@ -60,39 +105,225 @@ def analyze_corpus(corpus_dir):
             # JSON 파일에서 텍스트 추출
             text = extract_text_from_json(file_path)
             
-            # 형태소 분석 (명사와 동사 추출)
-            nouns = okt.nouns(text)  # 명사 추출
-            verbs = [word for word, pos in okt.pos(text) if pos.startswith('Verb')]  # 동사 추출
-            
-            # 2글자 이상인 단어만 선택
-            words = [word for word in nouns + verbs if len(word) > 1]
-            
             # 빈도 계산
-            word_freq.update(words)
+            word_freq.update(extract_words(okt, text, categories))
+        except Exception as e:
+            print(f"\nError processing {os.path.basename(file_path)}: {e}")
+    
+    return word_freq
+
+# 작업 프로세스마다 한 번만 초기화되는 형태소 분석기 (JVM 기동 비용이 크므로 재사용)
+_worker_okt = None
+_worker_categories = DEFAULT_CATEGORIES
+
+def _init_worker(categories=DEFAULT_CATEGORIES):
+    global _worker_okt, _worker_categories
+    _worker_okt = Okt()
+    _worker_categories = categories
+
+def _count_files(file_paths):
+    """작업 프로세스에서 파일 묶음의 단어 빈도를 계산해 부분 Counter로 반환합니다."""
+    partial_freq = Counter()
+    for file_path in file_paths:
+        try:
+            text = extract_text_from_json(file_path)
+            partial_freq.update(extract_words(_worker_okt, text, _worker_categories))
         except Exception as e:
             print(f"\nError processing {os.path.basename(file_path)}: {e}")
+    return len(file_paths), partial_freq
+
+def _count_file(file_path):
+    """
+    작업 프로세스에서 파일 하나의 단어 빈도를 계산합니다. (파일별 shard 저장용)
+
+    파일 하나의 오류가 전체 작업을 멈추지 않도록 예외는 여기서 잡아 돌려줍니다.
+
+    Returns:
+        tuple: (file_path, Counter, None) 또는 실패 시 (file_path, None, 오류 메시지)
+    """
+    try:
+        text = extract_text_from_json(file_path)
+        return file_path, Counter(extract_words(_worker_okt, text, _worker_categories)), None
+    except Exception as e:
+        return file_path, None, f"{type(e).__name__}: {e}"
+
+def _count_texts(texts):
+    """
+    작업 프로세스에서 이미 추출된 텍스트 묶음의 어절 수와 단어 빈도를 계산합니다.
+
+    Returns:
+        tuple: (텍스트 수, 어절 수, 부분 Counter)
+    """
+    partial_freq = Counter()
+    n_words = 0
+    for text in texts:
+        # 공백을 기준으로 어절 분리
+        n_words += len(text.split())
+        partial_freq.update(extract_words(_worker_okt, text, _worker_categories))
+    return len(texts), n_words, partial_freq
+
+def analyze_corpus_parallel(corpus_dir, n_workers=None, chunk_size=8, categories=DEFAULT_CATEGORIES):
+    """
+    코퍼스 파일을 여러 프로세스에 나누어 형태소 분석하고 빈도를 합칩니다.
+    
+    Args:
+        corpus_dir (str): 코퍼스 디렉토리 경로
+        n_workers (int, optional): 작업 프로세스 개수. None이면 CPU 개수
+        chunk_size (int): 한 작업 단위에 포함할 파일 수
+        categories (tuple): 추출할 품사 범주 (POS_CATEGORIES의 키)
+    
+    Returns:
+        Counter: 단어 빈도
+    """
+    json_files = get_all_files(corpus_dir)
+    print(f"총 {len(json_files)}개의 JSON 파일을 찾았습니다.")
+    
+    chunks = [json_files[i:i + chunk_size] for i in range(0, len(json_files), chunk_size)]
+    word_freq = Counter()
+    
+    print("형태소 분석기 초기화 중...")
+    with Pool(processes=n_workers, initializer=_init_worker, initargs=(tuple(categories),)) as pool:
+        with tqdm(total=len(json_files), desc="파일 처리 중") as progress:
+            for n_files, partial_freq in pool.imap_unordered(_count_files, chunks):
+                word_freq.update(partial_freq)
+                progress.update(n_files)
     
     return word_freq
 
-def visualize_and_save(word_freq, output_prefix='word_frequency'):
+def _corpus_signature(json_files):
+    """파일 목록, 크기, 수정 시각으로 코퍼스 변경 여부를 판별하는 값을 만듭니다."""
+    stats = [(path, os.path.getsize(path), int(os.path.getmtime(path))) for path in sorted(json_files)]
+    return hashlib.sha1(json.dumps(stats).encode('utf-8')).hexdigest()
+
+def ingest_corpus(corpus_dir, cache_path='corpus_cache.jsonl', rebuild=False):
+    """
+    코퍼스의 모든 JSON 파일을 한 번만 파싱해 발화 텍스트를 줄 단위 JSON 캐시로 저장합니다.
+    
+    첫 줄은 코퍼스 서명을 담은 헤더이며, 파일 목록/크기/수정 시각이 같으면 기존 캐시를
+    그대로 사용합니다.
+    
+    Args:
+        corpus_dir (str): 코퍼스 디렉토리 경로
+        cache_path (str): 캐시 파일 경로
+        rebuild (bool): True이면 서명과 관계없이 다시 생성
+    
+    Returns:
+        str: 캐시 파일 경로
+    """
+    json_files = get_all_files(corpus_dir)
+    signature = _corpus_signature(json_files)
+    
+    if not rebuild and os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline() or '{}')
+        if header.get('signature') == signature:
+            print(f"기존 코퍼스 캐시를 사용합니다: {cache_path}")
+            return cache_path
+    
+    print(f"코퍼스 캐시 생성 중: {len(json_files)}개 파일")
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'corpus_dir': corpus_dir, 'n_files': len(json_files),
+                            'signature': signature}, ensure_ascii=False) + '\n')
+        for file_path in tqdm(json_files, desc="파일 읽는 중"):
+            try:
+                text = extract_text_from_json(file_path)
+            except Exception as e:
+                print(f"\nError reading {os.path.basename(file_path)}: {e}")
+                continue
+            f.write(json.dumps({'file': os.path.relpath(file_path, corpus_dir), 'text': text},
+                               ensure_ascii=False) + '\n')
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+def iter_corpus_texts(cache_path):
+    """코퍼스 캐시에서 (파일, 텍스트)를 순서대로 읽습니다."""
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        f.readline()  # 헤더
+        for line in f:
+            record = json.loads(line)
+            yield record['file'], record['text']
+
+def corpus_statistics(cache_path, n_workers=None, chunk_size=64, categories=DEFAULT_CATEGORIES):
+    """
+    코퍼스 캐시를 한 번 읽으면서 총 어절 수와 단어 빈도를 함께 계산합니다.
+    
+    작업 프로세스에는 텍스트 묶음을 (프로세스 수 x 2)개씩만 넘기고, 그 결과를 모두 합친 뒤
+    다음 묶음을 읽으므로 코퍼스 크기와 관계없이 메모리에 올라오는 텍스트 양이 일정합니다.
+    
+    Args:
+        cache_path (str): ingest_corpus로 만든 캐시 파일 경로
+        n_workers (int, optional): 형태소 분석 프로세스 개수
+        chunk_size (int): 한 작업 단위에 포함할 텍스트 수
+        categories (tuple): 추출할 품사 범주 (POS_CATEGORIES의 키)
+    
+    Returns:
+        tuple: (total_words, word_freq) 총 어절 수와 단어 빈도 Counter
+    """
+    def text_chunks():
+        chunk = []
+        for _, text in iter_corpus_texts(cache_path):
+            chunk.append(text)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    chunks = text_chunks()
+    batch_size = (n_workers or os.cpu_count() or 1) * 2
+    total_words = 0
+    word_freq = Counter()
+    print("형태소 분석기 초기화 중...")
+    with Pool(processes=n_workers, initializer=_init_worker, initargs=(tuple(categories),)) as pool:
+        with tqdm(desc="텍스트 처리 중") as progress:
+            while True:
+                batch = list(islice(chunks, batch_size))
+                if not batch:
+                    break
+                for n_texts, n_words, partial_freq in pool.imap_unordered(_count_texts, batch):
+                    total_words += n_words
+                    word_freq.update(partial_freq)
+                    progress.update(n_texts)
+    
+    return total_words, word_freq
+
+def visualize_and_save(word_freq, output_prefix='word_frequency', fmt='parquet', xlsx=False):
+    """
+    단어 빈도를 기준 형식(Parquet/Feather)과 CSV로 저장하고 시각화합니다.
+
+    Args:
+        word_freq (Counter): 단어 빈도
+        output_prefix (str): 출력 파일 이름 접두사
+        fmt (str): 기준 출력 형식 ('parquet' 또는 'feather')
+        xlsx (bool): True이면 엑셀 파일도 스트리밍 방식으로 내보냄
+
+    Returns:
+        pd.DataFrame: 빈도 내림차순 단어 표
+    """
     print("\n데이터 시각화 및 저장 중...")
     
     # 데이터프레임 생성
     df = pd.DataFrame(word_freq.most_common(), columns=['단어', '빈도'])
     
-    # 엑셀 파일로 저장
-    print("엑셀 파일 저장 중...")
-    df.to_excel(f'{output_prefix}.xlsx', index=False)
+    # 기준 파일 저장
+    print(f"{fmt} 파일 저장 중...")
+    save_frequency_table(df, output_prefix, fmt)
     
     # CSV 파일로 저장
     print("CSV 파일 저장 중...")
     df.to_csv(f'{output_prefix}.csv', index=False, encoding='utf-8-sig')
     
+    # 엑셀 파일은 요청한 경우에만 저장
+    if xlsx:
+        print("엑셀 파일 저장 중...")
+        export_xlsx_streaming(df, f'{output_prefix}.xlsx')
+    
     if len(df) > 0:  # 데이터가 있는 경우에만 시각화
         # 상위 20개 단어 시각화
         print("상위 20개 단어 시각화 중...")
         plt.figure(figsize=(15, 8))
-        sns.barplot(data=df.head(20), x='단어', y='빈도')
+        sns.barplot(data=top_n_words(df, 20), x='단어', y='빈도')
         plt.xticks(rotation=45, ha='right')
         plt.title('상위 20개 단어 빈도')
         plt.tight_layout()
@@ -114,15 +345,12 @@ def visualize_and_save(word_freq, output_prefix='word_frequency'):
     
     return df
 
-def analyze_bottom_words(input_file='word_frequency.xlsx', n_words=100):
-    """하위 빈도 단어를 분석하고 시각화합니다."""
+def analyze_bottom_words(input_file='word_frequency.parquet', n_words=100):
+    """하위 빈도 단어를 분석하고 시각화합니다. (input_file에 DataFrame을 넘기면 그대로 사용)"""
     print(f"\n=== 하위 {n_words}개 단어 분석 시작 ===")
     
-    # 엑셀 파일 읽기
-    df = pd.read_excel(input_file)
-    
-    # 하위 n개 단어 추출
-    bottom_df = df.tail(n_words).iloc[::-1]  # 역순으로 정렬
+    # 기준 빈도표에서 하위 n개 단어 추출 (빈도 오름차순)
+    bottom_df = bottom_n_words(input_file, n_words)
     
     # 결과 저장
     output_prefix = 'bottom_words'
@@ -151,12 +379,17 @@ def analyze_bottom_words(input_file='word_frequency.xlsx', n_words=100):
     
     return bottom_df
 
-def count_total_words(corpus_dir):
-    """코퍼스의 총 어절 수를 계산하는 함수"""
+def count_total_words(corpus_dir, cache_path=None):
+    """코퍼스의 총 어절 수를 계산하는 함수 (cache_path가 있으면 캐시에서 읽음)"""
     total_words = 0
-    json_files = get_all_files(corpus_dir)
     
     print("\n총 어절 수 계산 중...")
+    if cache_path:
+        for _, text in tqdm(iter_corpus_texts(cache_path), desc="텍스트 처리 중"):
+            total_words += len(text.split())
+        return total_words
+    
+    json_files = get_all_files(corpus_dir)
     for file_path in tqdm(json_files, desc="파일 처리 중"):
         try:
             text = extract_text_from_json(file_path)
@@ -172,13 +405,13 @@ if __name__ == "__main__":
     # NIKL 코퍼스 디렉토리 경로 설정
     corpus_dir = "./NIKL_DIALOUGUE_2023"
     
-    # 총 어절 수 계산
-    total_words = count_total_words(corpus_dir)
-    print(f"\n총 어절 수: {total_words:,}개")
+    # 코퍼스를 한 번만 읽어 캐시 생성 (변경이 없으면 재사용)
+    cache_path = ingest_corpus(corpus_dir)
     
-    # 기존 분석 실행
+    # 캐시 한 번 순회로 총 어절 수와 단어 빈도 계산
     print("\n=== 코퍼스 분석 시작 ===")
-    word_freq = analyze_corpus(corpus_dir)
+    total_words, word_freq = corpus_statistics(cache_path)
+    print(f"\n총 어절 수: {total_words:,}개")
     
     df = visualize_and_save(word_freq)
     print("\n=== 분석 완료 ===")
@@ -187,10 +420,10 @@ if __name__ == "__main__":
     print(df.head(10).to_string(index=False))
     
     print("\n생성된 파일:")
-    print("1. word_frequency.xlsx - 전체 단어 빈도 (엑셀)")
+    print("1. word_frequency.parquet - 전체 단어 빈도 (기준 파일)")
     print("2. word_frequency.csv - 전체 단어 빈도 (CSV)")
     print("3. word_frequency_top20.png - 상위 20개 단어 그래프")
     print("4. word_frequency_distribution.png - 빈도 분포 히스토그램")
     
     # 하위 100개 단어 분석
-    bottom_df = analyze_bottom_words('word_frequency.xlsx', 100) 
\ No newline at end of file
+    bottom_df = analyze_bottom_words(df, 100) 
\ No newline at end of file
@@ -1,11 +1,13 @@
 import os
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import librosa
 import librosa.display
 import matplotlib.pyplot as plt
 import parselmouth
 from parselmouth import praat
-import sounddevice as sd
 from tqdm import tqdm
 
 # 한글 폰트 설정
@@ -148,34 +150,38 @@ def play_audio_segment(y, sr, start_time, end_time):
     end_sample = int(end_time * sr)
     segment = y[start_sample:end_sample]
     
+    # PortAudio가 없는 환경(배치 분석 서버 등)에서도 모듈을 import할 수 있도록 재생할 때만 불러옴
+    import sounddevice as sd
     print("재생 중...", end='', flush=True)
     sd.play(segment, sr)
     sd.wait()
     print(" 완료")
 
-def analyze_audio_file(file_path):
+def analyze_audio_file(file_path, verbose=True):
     """
     오디오 파일을 분석하고 자음/모음을 구분합니다.
     
     Args:
         file_path (str): 오디오 파일 경로
+        verbose (bool): 단계별 진행 메시지 출력 여부 (배치 모드에서는 False)
     
     Returns:
         tuple: (phonemes, y, sr) 음소 분석 결과, 오디오 데이터, 샘플링 레이트
     """
-    print(f"파일 분석 시작: {file_path}")
+    log = print if verbose else (lambda *args, **kwargs: None)
+    log(f"파일 분석 시작: {file_path}")
     
     y, sr = load_audio(file_path)
-    print(f"오디오 로드 완료: 샘플링 레이트 {sr}Hz")
+    log(f"오디오 로드 완료: 샘플링 레이트 {sr}Hz")
     
     mel_spec, times = create_mel_spectrogram(y, sr)
-    print(f"Mel-spectrogram 생성 완료: {len(times)} 프레임")
+    log(f"Mel-spectrogram 생성 완료: {len(times)} 프레임")
     
     f1_values, f2_values, formant_times = analyze_formants(y, sr)
-    print(f"포먼트 분석 완료: {len(f1_values)} 포인트")
+    log(f"포먼트 분석 완료: {len(f1_values)} 포인트")
     
     phonemes = detect_phonemes(mel_spec, times, f1_values, f2_values)
-    print(f"음소 구분 완료: {len(phonemes)} 개의 음소 발견")
+    log(f"음소 구분 완료: {len(phonemes)} 개의 음소 발견")
     
     return phonemes, y, sr
 
@@ -197,6 +203,43 @@ def save_results(file_path, phonemes):
     
     print(f"분석 결과가 저장되었습니다: {result_path}")
 
+def save_results_csv(file_path, phonemes):
+    """
+    분석 결과를 재검토/후처리용 CSV 파일로 저장합니다.
+    
+    Args:
+        file_path (str): 원본 오디오 파일 경로
+        phonemes (list): 음소 분석 결과
+    
+    Returns:
+        str: 저장된 CSV 파일 경로
+    """
+    result_path = file_path.replace('.wav', '_analysis.csv')
+    
+    with open(result_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['index', 'start', 'end', 'type'])
+        for i, (start, end, phoneme_type) in enumerate(phonemes):
+            writer.writerow([i + 1, f"{start:.6f}", f"{end:.6f}", phoneme_type])
+    
+    return result_path
+
+def load_results_csv(file_path):
+    """
+    save_results_csv로 저장한 분석 결과를 읽습니다.
+    
+    Args:
+        file_path (str): 원본 오디오 파일 경로
+    
+    Returns:
+        list: [(시작 시간, 종료 시간, 음소 타입), ...]
+    """
+    result_path = file_path.replace('.wav', '_analysis.csv')
+    
+    with open(result_path, 'r', encoding='utf-8', newline='') as f:
+        return [(float(row['start']), float(row['end']), row['type'])
+                for row in csv.DictReader(f)]
+
 def analyze_audio_directory(directory_path):
     """
     지정된 디렉토리 내의 모든 WAV 파일을 분석합니다.
@@ -224,6 +267,85 @@ def analyze_audio_directory(directory_path):
         except Exception as e:
             print(f"오류 발생: {str(e)}")
 
+def _analyze_and_save(file_path):
+    """
+    배치 모드 작업 단위: 한 파일을 분석하고 결과를 저장합니다. (재생 없음)
+    
+    Returns:
+        tuple: (파일 경로, 음소 개수, 오디오 길이(초))
+    """
+    phonemes, y, sr = analyze_audio_file(file_path, verbose=False)
+    save_results(file_path, phonemes)
+    save_results_csv(file_path, phonemes)
+    return file_path, len(phonemes), len(y) / sr
+
+def analyze_audio_directory_batch(directory_path, n_workers=None):
+    """
+    지정된 디렉토리 내의 모든 WAV 파일을 재생/입력 대기 없이 병렬로 분석합니다.
+    
+    각 파일마다 _analysis.txt와 _analysis.csv를 저장하며, 재검토는
+    review_audio_directory로 따로 수행합니다.
+    
+    Args:
+        directory_path (str): 분석할 디렉토리 경로
+        n_workers (int, optional): 프로세스 개수. None이면 CPU 개수
+    
+    Returns:
+        dict: {파일 경로: 음소 개수}
+    """
+    wav_files = [os.path.join(directory_path, f) for f in sorted(os.listdir(directory_path))
+                 if f.endswith('.wav')]
+    
+    print(f"총 {len(wav_files)}개의 WAV 파일을 찾았습니다.")
+    
+    results = {}
+    total_audio = 0.0
+    start = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = {executor.submit(_analyze_and_save, path): path for path in wav_files}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="파일 분석 중"):
+            path = futures[future]
+            try:
+                _, n_phonemes, duration = future.result()
+                results[path] = n_phonemes
+                total_audio += duration
+            except Exception as e:
+                print(f"\n오류 발생 ({os.path.basename(path)}): {str(e)}")
+    
+    elapsed = time.perf_counter() - start
+    if elapsed > 0:
+        print(f"\n처리 완료: {len(results)}/{len(wav_files)}개 파일, {elapsed:.1f}초 소요")
+        print(f"처리량: {len(results) / elapsed:.2f} 파일/초, "
+              f"오디오 {total_audio / elapsed:.1f}초/초 (실시간 대비 {total_audio / elapsed:.1f}배)")
+    
+    return results
+
+def review_audio_directory(directory_path):
+    """
+    배치 모드로 미리 계산된 _analysis.csv를 읽어 음소를 하나씩 재생하며 검토합니다.
+    
+    Args:
+        directory_path (str): 검토할 디렉토리 경로
+    """
+    wav_files = [f for f in sorted(os.listdir(directory_path)) if f.endswith('.wav')]
+    
+    for wav_file in wav_files:
+        file_path = os.path.join(directory_path, wav_file)
+        if not os.path.exists(file_path.replace('.wav', '_analysis.csv')):
+            print(f"분석 결과가 없어 건너뜁니다: {wav_file}")
+            continue
+        
+        print(f"\n검토 중: {wav_file}")
+        phonemes = load_results_csv(file_path)
+        y, sr = load_audio(file_path)
+        
+        for i, (start, end, phoneme_type) in enumerate(phonemes):
+            print(f"\n{phoneme_type} {i+1} 재생 중...")
+            play_audio_segment(y, sr, start, end)
+            input("다음 음소로 넘어가려면 Enter를 누르세요...")
+
 if __name__ == "__main__":
     filePath = "../../../../Desktop/results/participant_1"
-    analyze_audio_directory(filePath) 
\ No newline at end of file
+    analyze_audio_directory_batch(filePath)
+    # 재생하며 검토하려면: review_audio_directory(filePath) 
\ No newline at end of file
@@ -0,0 +1,219 @@
+import os
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from multiprocessing import Pool
+import pandas as pd
+from tqdm import tqdm
+from analyze_corpus import (get_all_files, _init_worker, _count_file, DEFAULT_CATEGORIES,
+                            visualize_and_save, analyze_bottom_words)
+from hangul import extract_korean
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    shard TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    size INTEGER,
+    mtime INTEGER,
+    categories TEXT,
+    added_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counts (
+    shard TEXT NOT NULL,
+    word TEXT NOT NULL,
+    freq INTEGER NOT NULL,
+    PRIMARY KEY (shard, word)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS totals (
+    word TEXT PRIMARY KEY,
+    freq INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_totals_freq ON totals (freq, word);
+"""
+
+def open_store(store_path='word_frequency.sqlite'):
+    """
+    파일(shard)별 단어 빈도를 보관하는 저장소를 엽니다. 없으면 새로 만듭니다.
+
+    counts에는 shard별 빈도가, totals에는 모든 shard를 합친 빈도가 들어 있으며
+    shard를 추가/교체/삭제할 때마다 totals를 증분으로 갱신합니다.
+    """
+    conn = sqlite3.connect(store_path)
+    conn.executescript(SCHEMA)
+    # categories 열이 없던 저장소는 열을 추가 (기존 shard는 다음 갱신 때 다시 처리됨)
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(shards)')}
+    if 'categories' not in columns:
+        with conn:
+            conn.execute('ALTER TABLE shards ADD COLUMN categories TEXT')
+    return conn
+
+def categories_signature(categories):
+    """shard를 계산할 때 쓴 품사 범주를 순서와 무관한 문자열로 만듭니다."""
+    return ','.join(sorted(categories))
+
+def _remove_shard(conn, shard):
+    conn.execute("""
+        UPDATE totals SET freq = freq - (
+            SELECT c.freq FROM counts c WHERE c.shard = ? AND c.word = totals.word)
+        WHERE word IN (SELECT word FROM counts WHERE shard = ?)
+    """, (shard, shard))
+    conn.execute('DELETE FROM totals WHERE freq <= 0')
+    conn.execute('DELETE FROM counts WHERE shard = ?', (shard,))
+    conn.execute('DELETE FROM shards WHERE shard = ?', (shard,))
+
+def put_shard(conn, shard, counter, source, size=None, mtime=None, categories=None):
+    """
+    shard 하나의 빈도를 저장합니다. 같은 이름의 shard가 있으면 교체합니다.
+
+    Args:
+        conn (sqlite3.Connection): open_store로 연 저장소
+        shard (str): shard 이름 (예: 'NIKL_DIALOUGUE_2023/xxx.json')
+        counter (Counter): 단어 빈도
+        source (str): 코퍼스 이름
+        size, mtime (int, optional): 원본 파일 크기와 수정 시각 (변경 감지용)
+        categories (str, optional): 빈도를 계산할 때 쓴 품사 범주 (categories_signature)
+    """
+    with conn:
+        _remove_shard(conn, shard)
+        conn.execute('INSERT INTO shards (shard, source, size, mtime, categories, added_at) '
+                     'VALUES (?, ?, ?, ?, ?, ?)',
+                     (shard, source, size, mtime, categories, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.executemany('INSERT INTO counts (shard, word, freq) VALUES (?, ?, ?)',
+                         ((shard, word, int(freq)) for word, freq in counter.items()))
+        conn.execute("""
+            INSERT INTO totals (word, freq) SELECT word, freq FROM counts WHERE shard = ?
+            ON CONFLICT(word) DO UPDATE SET freq = freq + excluded.freq
+        """, (shard,))
+
+def remove_shard(conn, shard):
+    """shard 하나를 삭제하고 합산 빈도에서 뺍니다."""
+    with conn:
+        _remove_shard(conn, shard)
+
+def remove_source(conn, source):
+    """코퍼스(source)에 속한 모든 shard를 삭제합니다."""
+    shards = [row[0] for row in conn.execute('SELECT shard FROM shards WHERE source = ?', (source,))]
+    with conn:
+        for shard in shards:
+            _remove_shard(conn, shard)
+    return len(shards)
+
+def update_from_corpus(conn, corpus_dir, source=None, n_workers=None, chunk_size=4,
+                       categories=DEFAULT_CATEGORIES):
+    """
+    코퍼스 디렉토리에서 새로 추가되었거나 변경된 JSON 파일만 형태소 분석해 저장소에 반영합니다.
+
+    파일 크기/수정 시각과 함께 품사 범주도 비교하므로, categories를 바꾸면 해당 코퍼스의
+    shard를 모두 다시 계산합니다. 처리 중 오류가 난 파일은 건너뛰고 로그를 남기며,
+    그 파일의 이전 shard는 지워 다음 갱신 때 다시 시도합니다.
+
+    Args:
+        conn (sqlite3.Connection): open_store로 연 저장소
+        corpus_dir (str): 코퍼스 디렉토리 경로
+        source (str, optional): 코퍼스 이름. None이면 디렉토리 이름
+        n_workers (int, optional): 작업 프로세스 개수
+        chunk_size (int): 작업 프로세스에 한 번에 넘길 파일 수
+        categories (tuple): 추출할 품사 범주
+
+    Returns:
+        int: 새로 처리한 파일 수 (오류 난 파일 제외)
+    """
+    source = source or os.path.basename(os.path.normpath(corpus_dir))
+    signature = categories_signature(categories)
+    known = {shard: (size, mtime, shard_categories) for shard, size, mtime, shard_categories in
+             conn.execute('SELECT shard, size, mtime, categories FROM shards WHERE source = ?', (source,))}
+
+    pending = {}
+    seen = set()
+    for file_path in get_all_files(corpus_dir):
+        shard = f"{source}/{os.path.relpath(file_path, corpus_dir)}"
+        seen.add(shard)
+        stat = os.stat(file_path)
+        if known.get(shard) != (stat.st_size, int(stat.st_mtime), signature):
+            pending[file_path] = (shard, stat.st_size, int(stat.st_mtime))
+
+    # 코퍼스에서 사라진 파일의 빈도는 합산에서 제외
+    for shard in set(known) - seen:
+        remove_shard(conn, shard)
+
+    print(f"{source}: {len(pending)}개 파일을 새로 처리합니다. (기존 {len(known)}개)")
+    if not pending:
+        return 0
+
+    failed = []
+    with Pool(processes=n_workers, initializer=_init_worker, initargs=(tuple(categories),)) as pool:
+        results = pool.imap_unordered(_count_file, list(pending), chunksize=chunk_size)
+        for file_path, counter, error in tqdm(results, total=len(pending), desc="파일 처리 중"):
+            shard, size, mtime = pending[file_path]
+            if error is not None:
+                print(f"\nError processing {os.path.basename(file_path)}: {error}")
+                remove_shard(conn, shard)
+                failed.append(file_path)
+                continue
+            put_shard(conn, shard, counter, source, size, mtime, signature)
+
+    if failed:
+        print(f"{source}: {len(failed)}개 파일을 처리하지 못했습니다.")
+    return len(pending) - len(failed)
+
+def add_frequency_table(conn, table_path, source='일반어휘통계', word_col='어휘', freq_col='빈도'):
+    """
+    이미 집계된 빈도표(예: 일반어휘통계.xlsx)를 shard 하나로 추가합니다.
+
+    어휘에서 한글만 남긴 뒤 동형어의 빈도를 합칩니다.
+    """
+    if table_path.endswith('.csv'):
+        table = pd.read_csv(table_path)
+    else:
+        table = pd.read_excel(table_path)
+    words = table[word_col].astype(str).map(extract_korean)
+    counter = Counter(table[freq_col].groupby(words).sum().to_dict())
+    counter.pop('', None)
+    stat = os.stat(table_path)
+    put_shard(conn, f"{source}/{os.path.basename(table_path)}", counter, source,
+              stat.st_size, int(stat.st_mtime))
+    return len(counter)
+
+def _query_frequencies(conn, ascending, limit, sources):
+    order = 'ASC' if ascending else 'DESC'
+    params = []
+    if sources is None:
+        sql = f'SELECT word, freq FROM totals ORDER BY freq {order}, word'
+    else:
+        sources = [sources] if isinstance(sources, str) else list(sources)
+        sql = (f'SELECT c.word, SUM(c.freq) AS freq FROM counts c JOIN shards s ON c.shard = s.shard '
+               f'WHERE s.source IN ({",".join("?" * len(sources))}) GROUP BY c.word '
+               f'ORDER BY freq {order}, c.word')
+        params.extend(sources)
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(int(limit))
+    return pd.read_sql_query(sql, conn, params=params).rename(columns={'word': '단어', 'freq': '빈도'})
+
+def top_words(conn, n=None, sources=None):
+    """합산 빈도 상위 n개 단어 (n=None이면 전체, 빈도 내림차순)"""
+    return _query_frequencies(conn, ascending=False, limit=n, sources=sources)
+
+def bottom_words(conn, n=100, sources=None):
+    """합산 빈도 하위 n개 단어 (빈도 오름차순)"""
+    return _query_frequencies(conn, ascending=True, limit=n, sources=sources)
+
+def merged_counts(conn, sources=None):
+    """저장소의 합산 빈도를 Counter로 반환합니다."""
+    df = top_words(conn, sources=sources)
+    return Counter(dict(zip(df['단어'], df['빈도'])))
+
+if __name__ == "__main__":
+    conn = open_store('word_frequency.sqlite')
+
+    # 새 파일/변경된 파일만 처리
+    update_from_corpus(conn, "./NIKL_DIALOUGUE_2023")
+    # 일반어휘통계를 함께 쓰려면:
+    # add_frequency_table(conn, "./Korean Language Usage Frequency Study/일반어휘통계.xlsx")
+
+    df = visualize_and_save(merged_counts(conn, sources='NIKL_DIALOUGUE_2023'))
+    print(f"총 {len(df):,}개의 고유 단어")
+
+    # 하위 단어는 저장소에서 바로 조회
+    analyze_bottom_words(bottom_words(conn, 100, sources='NIKL_DIALOUGUE_2023'), 100)
+    conn.close()
@@ -0,0 +1,69 @@
+"""
+단어 빈도표(Parquet/Feather/CSV/Excel) 읽기/쓰기와 상위/하위 단어 조회.
+
+형태소 분석(konlpy)에 의존하지 않으므로 저장된 빈도표만 다루는 스크립트는 이 모듈을 import합니다.
+"""
+import os
+import pandas as pd
+
+def load_frequency_table(path='word_frequency.parquet'):
+    """
+    단어 빈도표를 읽습니다. 확장자에 따라 Parquet/Feather/CSV/Excel을 선택합니다.
+
+    Args:
+        path (str): 빈도표 경로 (기본값은 visualize_and_save의 기준 출력)
+
+    Returns:
+        pd.DataFrame: 단어, 빈도
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        return pd.read_parquet(path)
+    if ext == '.feather':
+        return pd.read_feather(path)
+    if ext == '.csv':
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+def save_frequency_table(df, output_prefix='word_frequency', fmt='parquet'):
+    """
+    빈도표를 기준 형식(Parquet 또는 Feather)으로 저장합니다.
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    if fmt not in ('parquet', 'feather'):
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    path = f'{output_prefix}.{fmt}'
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(path)
+    return path
+
+def export_xlsx_streaming(df, output_path, sheet_name='Sheet1', chunk_size=10000):
+    """
+    openpyxl write-only 모드로 행을 순서대로 흘려 쓰며 엑셀 파일을 저장합니다.
+
+    셀 객체를 메모리에 쌓지 않으므로 행이 많은 표도 일정한 메모리로 내보낼 수 있습니다.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append(list(df.columns))
+    for start in range(0, len(df), chunk_size):
+        for row in df.iloc[start:start + chunk_size].itertuples(index=False):
+            ws.append([value.item() if hasattr(value, 'item') else value for value in row])
+    wb.save(output_path)
+    return output_path
+
+def top_n_words(source='word_frequency.parquet', n=20):
+    """빈도표(경로 또는 DataFrame)에서 빈도 상위 n개 단어를 내림차순으로 반환합니다."""
+    df = source if isinstance(source, pd.DataFrame) else load_frequency_table(source)
+    return df.nlargest(n, '빈도').reset_index(drop=True)
+
+def bottom_n_words(source='word_frequency.parquet', n=100):
+    """빈도표(경로 또는 DataFrame)에서 빈도 하위 n개 단어를 오름차순으로 반환합니다."""
+    df = source if isinstance(source, pd.DataFrame) else load_frequency_table(source)
+    return df.nsmallest(n, '빈도', keep='last').reset_index(drop=True)
@@ -0,0 +1,130 @@
+import re
+import numpy as np
+
+# 초성 리스트
+CHOSUNG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 중성 리스트
+JUNGSUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
+# 종성 리스트 (공백은 종성 없음을 의미)
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+HANGUL_BASE = 0xAC00
+
+def extract_korean(text):
+    """문자열에서 한글(자모, 완성형 글자)만 남깁니다."""
+    # ㄱ-ㅎ: 자음, ㅏ-ㅣ: 모음, 가-힣: 완성된 한글 글자
+    return ''.join(re.findall('[ㄱ-ㅎㅏ-ㅣ가-힣]+', text))
+
+def decompose_syllable(char):
+    """
+    완성형 한글 한 글자를 (초성, 중성, 종성)으로 분해합니다.
+
+    Returns:
+        tuple: (초성, 중성, 종성). 종성이 없으면 ''. 한글 음절이 아니면 None
+    """
+    if not '가' <= char <= '힣':
+        return None
+    # 유니코드 값에서 한글 시작 값(0xAC00) 빼기
+    char_code = ord(char) - HANGUL_BASE
+    cho_idx = char_code // (21 * 28)
+    jung_idx = (char_code % (21 * 28)) // 28
+    jong_idx = char_code % 28
+    return CHOSUNG[cho_idx], JUNGSUNG[jung_idx], JONGSUNG[jong_idx]
+
+def decompose_hangul_phoneme(text):
+    """
+    단어를 초성/중성/종성 리스트로 분해합니다. (data.ipynb와 같은 형식)
+
+    종성 리스트에는 종성이 있는 글자의 종성만 들어갑니다.
+
+    Returns:
+        tuple: (초성 리스트, 중성 리스트, 종성 리스트)
+    """
+    chosung_list = []
+    jungsung_list = []
+    jongsung_list = []
+    for char in text:
+        parts = decompose_syllable(char)
+        if parts is None:
+            continue
+        chosung_list.append(parts[0])
+        jungsung_list.append(parts[1])
+        if parts[2]:  # 종성이 있는 경우만 추가
+            jongsung_list.append(parts[2])
+    return chosung_list, jungsung_list, jongsung_list
+
+# 인덱스 -1(한글 음절이 아닌 칸)이 ''로 바뀌도록 끝에 빈 문자열을 둔 조회표
+_CHOSUNG_TABLE = np.array(CHOSUNG + [''])
+_JUNGSUNG_TABLE = np.array(JUNGSUNG + [''])
+_JONGSUNG_TABLE = np.array(JONGSUNG + [''])
+
+def decompose_hangul_array(words):
+    """
+    단어 배열 전체를 NumPy 코드포인트 연산으로 한 번에 분해합니다.
+
+    단어들을 고정 폭 유니코드 배열로 만든 뒤 uint32 코드포인트로 보고 초성/중성/종성
+    인덱스를 계산합니다. 결과는 (단어 수, 최대 글자 수) 배열이며, 글자 위치 그대로
+    정렬되어 한글 음절이 아닌 칸과 패딩은 ''입니다. 종성이 없는 음절의 종성도 ''입니다.
+
+    Args:
+        words (Sequence[str] | pd.Series): 단어 목록
+
+    Returns:
+        tuple: (onset, nucleus, coda) 각각 shape (n, max_len)인 문자열 배열
+    """
+    arr = np.asarray(list(words), dtype=str)
+    if arr.size == 0 or arr.itemsize == 0:
+        empty = np.zeros((arr.size, 0), dtype='<U1')
+        return empty, empty.copy(), empty.copy()
+    codepoints = arr.view(np.uint32).reshape(len(arr), -1).astype(np.int64)
+
+    code = codepoints - HANGUL_BASE
+    valid = (code >= 0) & (code < 19 * 21 * 28)
+    cho_idx = np.where(valid, code // (21 * 28), -1)
+    jung_idx = np.where(valid, (code % (21 * 28)) // 28, -1)
+    jong_idx = np.where(valid, code % 28, -1)
+
+    return _CHOSUNG_TABLE[cho_idx], _JUNGSUNG_TABLE[jung_idx], _JONGSUNG_TABLE[jong_idx]
+
+def syllable_counts(onset):
+    """decompose_hangul_array 결과에서 단어별 한글 음절 수를 계산합니다."""
+    return (onset != '').sum(axis=1)
+
+def _phoneme_mask(parts, spec, n_syllables):
+    """음소 조건(집합 또는 {위치: 집합})에 맞는 행 마스크를 만듭니다."""
+    if isinstance(spec, dict):
+        mask = np.ones(len(parts), dtype=bool)
+        for position, values in spec.items():
+            if position >= parts.shape[1]:
+                return np.zeros(len(parts), dtype=bool)
+            mask &= np.isin(parts[:, position], list(values))
+        return mask
+    # 모든 음절이 조건을 만족해야 함 (패딩 칸은 제외)
+    in_word = np.arange(parts.shape[1])[None, :] < n_syllables[:, None]
+    return (np.isin(parts, list(spec)) | ~in_word).all(axis=1)
+
+def filter_words(df, col_name, n_syllables=None, onsets=None, nuclei=None, codas=None):
+    """
+    DataFrame의 단어 컬럼을 한 번에 분해해 음절수/음소 조건으로 거릅니다.
+
+    조건 형식은 lexicon_db.query_lexicon과 같습니다. 집합이면 모든 음절에,
+    {위치: 집합}이면 해당 위치(0부터)에만 적용하며, 종성 없음은 ''로 지정합니다.
+
+    Args:
+        df (pd.DataFrame): 단어 표
+        col_name (str): 단어 컬럼 이름
+        n_syllables (int, optional): 음절수
+        onsets, nuclei, codas: 허용할 초성/중성/종성
+
+    Returns:
+        pd.DataFrame: 조건을 만족하는 행 (인덱스 재설정)
+    """
+    onset, nucleus, coda = decompose_hangul_array(df[col_name])
+    counts = syllable_counts(onset)
+    mask = np.ones(len(df), dtype=bool)
+    if n_syllables is not None:
+        mask &= counts == n_syllables
+    for parts, spec in ((onset, onsets), (nucleus, nuclei), (coda, codas)):
+        if spec is not None:
+            mask &= _phoneme_mask(parts, spec, counts)
+    return df[mask].reset_index(drop=True)
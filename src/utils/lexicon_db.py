@@ -0,0 +1,278 @@
+import os
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+from hangul import extract_korean, decompose_hangul_array, syllable_counts
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    word TEXT PRIMARY KEY,
+    n_syllables INTEGER NOT NULL,
+    freq INTEGER NOT NULL,
+    freq1 INTEGER NOT NULL,
+    freq2 INTEGER NOT NULL,
+    pos TEXT,
+    okt_pos TEXT
+);
+CREATE TABLE IF NOT EXISTS syllables (
+    word TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    onset TEXT NOT NULL,
+    nucleus TEXT NOT NULL,
+    coda TEXT NOT NULL,
+    PRIMARY KEY (word, position)
+);
+CREATE INDEX IF NOT EXISTS idx_words_len_freq ON words (n_syllables, freq);
+CREATE INDEX IF NOT EXISTS idx_syl_onset ON syllables (position, onset);
+CREATE INDEX IF NOT EXISTS idx_syl_nucleus ON syllables (position, nucleus);
+CREATE INDEX IF NOT EXISTS idx_syl_coda ON syllables (position, coda);
+"""
+
+# 조회 결과 컬럼 이름 (data.ipynb의 main_df와 같은 형식)
+RESULT_COLUMNS = {
+    'word': '단어', 'freq': '빈도', 'n_syllables': '음절수',
+    'onsets': '초성', 'nuclei': '중성', 'codas': '종성',
+    'pos': '품사', 'okt_pos': 'Okt품사', 'freq1': '빈도1', 'freq2': '빈도2',
+}
+
+def load_corpus_frequencies(freq1_path, freq2_path=None):
+    """
+    두 코퍼스의 빈도표를 읽어 단어별 빈도1/빈도2/품사로 합칩니다.
+
+    Args:
+        freq1_path (str): word_frequency.parquet 또는 .csv (단어, 빈도)
+        freq2_path (str, optional): 일반어휘통계.xlsx (빈도, 어휘, 품사 ...)
+
+    Returns:
+        pd.DataFrame: word, freq1, freq2, freq, pos
+    """
+    if freq1_path.endswith('.parquet'):
+        corpus1 = pd.read_parquet(freq1_path, columns=['단어', '빈도'])
+    else:
+        corpus1 = pd.read_csv(freq1_path)[['단어', '빈도']]
+    corpus1 = corpus1.rename(columns={'단어': 'word', '빈도': 'freq1'})
+    corpus1 = corpus1.groupby('word', as_index=False)['freq1'].sum()
+
+    if freq2_path:
+        corpus2 = pd.read_excel(freq2_path)
+        corpus2['word'] = corpus2['어휘'].astype(str).map(extract_korean)
+        # 동형어는 빈도를 합치고, 품사는 가장 빈도가 높은 항목의 것을 사용
+        corpus2 = corpus2.sort_values(by='빈도', ascending=False)
+        corpus2 = corpus2.groupby('word', as_index=False).agg(freq2=('빈도', 'sum'), pos=('품사', 'first'))
+        merged = corpus1.merge(corpus2, on='word', how='outer')
+    else:
+        merged = corpus1.assign(freq2=0, pos=None)
+
+    merged['freq1'] = merged['freq1'].fillna(0).astype(int)
+    merged['freq2'] = merged['freq2'].fillna(0).astype(int)
+    merged['freq'] = merged['freq1'] + merged['freq2']
+
+    # 완성형 한글 음절로만 이루어진 단어만 사용
+    merged = merged[merged['word'].str.fullmatch('[가-힣]+', na=False)]
+    return merged.reset_index(drop=True)
+
+def _tag_okt_pos(words):
+    from konlpy.tag import Okt
+    okt = Okt()
+    tags = []
+    for word in tqdm(words, desc="품사 태깅 중"):
+        tags.append('+'.join(pos for _, pos in okt.pos(word)))
+    return tags
+
+def build_lexicon(freq1_path, freq2_path=None, db_path='lexicon.sqlite', tag_pos=False):
+    """
+    음절수, 음절별 초성/중성/종성, 코퍼스별 빈도, 품사를 담은 색인된 어휘 DB를 만듭니다.
+
+    Args:
+        freq1_path (str): word_frequency.parquet 또는 .csv 경로
+        freq2_path (str, optional): 일반어휘통계.xlsx 경로
+        db_path (str): 생성할 SQLite 파일 경로 (이미 있으면 새로 만듦)
+        tag_pos (bool): True이면 Okt 품사 태그도 저장 (느림)
+
+    Returns:
+        str: DB 파일 경로
+    """
+    lexicon = load_corpus_frequencies(freq1_path, freq2_path)
+    onset, nucleus, coda = decompose_hangul_array(lexicon['word'])
+    lexicon['n_syllables'] = syllable_counts(onset)
+    lexicon['okt_pos'] = _tag_okt_pos(lexicon['word']) if tag_pos else None
+
+    # 음절 위치별 행으로 펼치기 (패딩 칸 제외)
+    rows, positions = np.nonzero(onset != '')
+    syllables = zip(lexicon['word'].to_numpy()[rows].tolist(), positions.tolist(),
+                    onset[rows, positions].tolist(), nucleus[rows, positions].tolist(),
+                    coda[rows, positions].tolist())
+
+    columns = ['word', 'n_syllables', 'freq', 'freq1', 'freq2', 'pos', 'okt_pos']
+    # sqlite3에 넘길 수 있도록 파이썬 기본 자료형과 None으로 변환
+    words = [[None if pd.isna(value) else value for value in lexicon[col].tolist()] for col in columns]
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            f'INSERT INTO words ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})',
+            zip(*words))
+        conn.executemany(
+            'INSERT INTO syllables (word, position, onset, nucleus, coda) VALUES (?, ?, ?, ?, ?)',
+            syllables)
+        conn.execute('ANALYZE')
+
+    print(f"어휘 DB 생성 완료: {len(lexicon):,}개 단어 -> {db_path}")
+    return db_path
+
+def _phoneme_condition(column, spec, params):
+    """
+    음소 조건을 SQL 조건식으로 변환합니다.
+
+    spec이 집합/리스트이면 모든 음절에, {위치: 집합} 딕셔너리이면 해당 위치(0부터)에만 적용합니다.
+    """
+    if isinstance(spec, dict):
+        clauses = []
+        for position, values in spec.items():
+            values = list(values)
+            clauses.append(
+                f'EXISTS (SELECT 1 FROM syllables s WHERE s.word = w.word AND s.position = ? '
+                f'AND s.{column} IN ({",".join("?" * len(values))}))')
+            params.extend([position] + values)
+        return clauses
+
+    values = list(spec)
+    params.extend(values)
+    return [f'NOT EXISTS (SELECT 1 FROM syllables s WHERE s.word = w.word '
+            f'AND s.{column} NOT IN ({",".join("?" * len(values))}))']
+
+def query_lexicon(db_path, n_syllables=None, onsets=None, nuclei=None, codas=None,
+                  pos=None, okt_pos=None, min_freq=None, max_freq=None,
+                  order_by='freq', ascending=True, limit=None):
+    """
+    어휘 DB에서 조건에 맞는 단어를 조회합니다.
+
+    예) 2음절, 첫 음절 초성 ∈ {ㅂ,ㅍ,ㅅ,ㅁ,ㄴ}, 두 음절 중성 모두 ∈ {ㅏ,ㅐ,ㅣ,ㅗ,ㅜ}, 저빈도 50개:
+        query_lexicon(db, n_syllables=2, onsets={0: 'ㅂㅍㅅㅁㄴ'}, nuclei='ㅏㅐㅣㅗㅜ', limit=50)
+
+    Args:
+        db_path (str): build_lexicon으로 만든 DB 경로
+        n_syllables (int, optional): 음절수
+        onsets, nuclei, codas: 허용할 초성/중성/종성. 집합(모든 음절) 또는 {위치: 집합}.
+            종성 없음은 ''로 지정
+        pos (str | list, optional): 일반어휘통계 품사 (예: '명')
+        okt_pos (str | list, optional): Okt 품사 (예: 'Noun')
+        min_freq, max_freq (int, optional): 합산 빈도 범위
+        order_by (str): 정렬 기준 컬럼 (freq, freq1, freq2, word)
+        ascending (bool): 오름차순 여부
+        limit (int, optional): 최대 개수
+
+    Returns:
+        pd.DataFrame: 단어, 빈도, 음절수, 초성, 중성, 종성, 품사, Okt품사, 빈도1, 빈도2
+    """
+    if order_by not in ('freq', 'freq1', 'freq2', 'word', 'n_syllables'):
+        raise ValueError(f"order_by: {order_by} not supported")
+
+    clauses = []
+    params = []
+    if n_syllables is not None:
+        clauses.append('w.n_syllables = ?')
+        params.append(n_syllables)
+    for column, spec in (('onset', onsets), ('nucleus', nuclei), ('coda', codas)):
+        if spec is not None:
+            clauses.extend(_phoneme_condition(column, spec, params))
+    for column, value in (('pos', pos), ('okt_pos', okt_pos)):
+        if value is not None:
+            values = [value] if isinstance(value, str) else list(value)
+            clauses.append(f'w.{column} IN ({",".join("?" * len(values))})')
+            params.extend(values)
+    if min_freq is not None:
+        clauses.append('w.freq >= ?')
+        params.append(min_freq)
+    if max_freq is not None:
+        clauses.append('w.freq <= ?')
+        params.append(max_freq)
+
+    sql = 'SELECT w.* FROM words w'
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    sql += f' ORDER BY w.{order_by} {"ASC" if ascending else "DESC"}, w.word'
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(int(limit))
+
+    with sqlite3.connect(db_path) as conn:
+        words = pd.read_sql_query(sql, conn, params=params)
+        if words.empty:
+            return pd.DataFrame(columns=list(RESULT_COLUMNS.values()))
+        syllables = pd.read_sql_query(
+            f'SELECT s.* FROM syllables s JOIN ({sql}) w ON s.word = w.word ORDER BY s.word, s.position',
+            conn, params=params)
+
+    # 음절별 음소를 notebook과 같은 리스트 형식으로 (종성은 있는 것만)
+    grouped = syllables.groupby('word', sort=False)
+    phonemes = pd.DataFrame({
+        'onsets': grouped['onset'].agg(list),
+        'nuclei': grouped['nucleus'].agg(list),
+        'codas': grouped['coda'].agg(list).map(lambda codas: [c for c in codas if c]),
+    })
+    result = words.join(phonemes, on='word')
+    return result[list(RESULT_COLUMNS)].rename(columns=RESULT_COLUMNS)
+
+def _parse_phoneme_spec(values):
+    """CLI 인자 'ㅂㅍㅅ' 또는 '1:ㅂㅍㅅ'(1부터 시작하는 음절 위치)를 query_lexicon 형식으로 변환합니다."""
+    if not values:
+        return None
+    spec = {}
+    for value in values:
+        position, _, phonemes = value.rpartition(':')
+        phonemes = {'' if p == '_' else p for p in phonemes.replace(',', '')}
+        if not position:
+            return phonemes
+        spec[int(position) - 1] = phonemes
+    return spec
+
+def main():
+    parser = argparse.ArgumentParser(description='자극 단어 선정용 어휘 DB')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='빈도표로 어휘 DB 생성')
+    build_parser.add_argument('--freq1', default='word_frequency.parquet')
+    build_parser.add_argument('--freq2', default=None, help='일반어휘통계.xlsx 경로')
+    build_parser.add_argument('--db', default='lexicon.sqlite')
+    build_parser.add_argument('--tag-pos', action='store_true', help='Okt 품사 태깅 포함')
+
+    query_parser = subparsers.add_parser('query', help='조건으로 단어 조회')
+    query_parser.add_argument('--db', default='lexicon.sqlite')
+    query_parser.add_argument('--syllables', type=int)
+    query_parser.add_argument('--onset', action='append', help="예: 'ㅂㅍㅅㅁㄴ' 또는 '1:ㅂㅍㅅㅁㄴ'")
+    query_parser.add_argument('--nucleus', action='append', help="예: 'ㅏㅐㅣㅗㅜ'")
+    query_parser.add_argument('--coda', action='append', help="종성 없음은 '_'")
+    query_parser.add_argument('--pos', help="일반어휘통계 품사 (예: 명)")
+    query_parser.add_argument('--okt-pos', help="Okt 품사 (예: Noun)")
+    query_parser.add_argument('--max-freq', type=int)
+    query_parser.add_argument('--most-frequent', action='store_true', help='고빈도 순으로 정렬')
+    query_parser.add_argument('--limit', type=int, default=50)
+    query_parser.add_argument('--output', help='결과를 저장할 .xlsx/.csv 경로')
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        build_lexicon(args.freq1, args.freq2, args.db, tag_pos=args.tag_pos)
+        return
+
+    df = query_lexicon(args.db, n_syllables=args.syllables,
+                       onsets=_parse_phoneme_spec(args.onset),
+                       nuclei=_parse_phoneme_spec(args.nucleus),
+                       codas=_parse_phoneme_spec(args.coda),
+                       pos=args.pos, okt_pos=args.okt_pos, max_freq=args.max_freq,
+                       ascending=not args.most_frequent, limit=args.limit)
+    print(df.to_string(index=False))
+    print(f"\n총 {len(df)}개 단어")
+    if args.output:
+        if args.output.endswith('.csv'):
+            df.to_csv(args.output, index=False, encoding='utf-8-sig')
+        else:
+            df.to_excel(args.output, index=False)
+        print(f"저장됨: {args.output}")
+
+if __name__ == "__main__":
+    main()
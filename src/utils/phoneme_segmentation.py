@@ -7,6 +7,7 @@ import parselmouth
 from parselmouth import praat
 import os
 import sounddevice as sd
+import soundfile as sf
 
 def load_audio(file_path):
     """
@@ -247,6 +248,149 @@ def analyze_audio_file(file_path, phoneme_number=None):
     
     return phonemes, y, sr  # y와 sr도 함께 반환하도록 수정
 
+def _formant_voiced_mask(y, sr, frame_times):
+    """
+    프레임 시각마다 F1, F2가 모두 검출되는지(모음 후보인지) 판정합니다.
+    
+    Args:
+        y (np.ndarray): 블록 오디오 데이터
+        sr (int): 샘플링 레이트
+        frame_times (np.ndarray): 블록 시작 기준 프레임 시각 (초)
+    
+    Returns:
+        np.ndarray: 프레임별 bool 마스크
+    """
+    sound = parselmouth.Sound(y, sr)
+    formants = sound.to_formant_burg(time_step=0.01,
+                                    max_number_of_formants=5.0,
+                                    maximum_formant=5000.0,
+                                    window_length=0.025,
+                                    pre_emphasis_from=50.0)
+    mask = np.zeros(len(frame_times), dtype=bool)
+    for i, t in enumerate(frame_times):
+        f1 = formants.get_value_at_time(1, t)
+        f2 = formants.get_value_at_time(2, t)
+        mask[i] = bool(np.isfinite(f1) and np.isfinite(f2) and f1 > 0 and f2 > 0)
+    return mask
+
+class RunningEnergyNormalizer:
+    """
+    블록 단위로 갱신되는 에너지 정규화 통계.
+    
+    블록마다 하위/상위 백분위수(기본 5%, 95%)를 구해 지수 이동 평균으로 누적하므로,
+    순간적인 클릭음 하나가 세션 전체의 임계값을 바꾸지 않습니다.
+    """
+    def __init__(self, low_percentile=5, high_percentile=95, smoothing=0.1):
+        self.low_percentile = low_percentile
+        self.high_percentile = high_percentile
+        self.smoothing = smoothing
+        self.floor = None
+        self.ceiling = None
+
+    def update(self, energy):
+        low, high = np.percentile(energy, [self.low_percentile, self.high_percentile])
+        if self.floor is None:
+            self.floor, self.ceiling = low, high
+        else:
+            a = self.smoothing
+            self.floor = (1 - a) * self.floor + a * low
+            self.ceiling = (1 - a) * self.ceiling + a * high
+
+    def normalize(self, energy):
+        span = max(self.ceiling - self.floor, 1e-6)
+        return np.clip((energy - self.floor) / span, 0.0, 1.0)
+
+def stream_phonemes(file_path, block_duration=10.0, overlap_duration=0.5, n_mels=128,
+                    hop_length=512, energy_threshold=0.3, min_duration=0.05,
+                    normalizer=None):
+    """
+    긴 녹음 파일을 고정 크기 블록으로 읽으면서 자음/모음 구간을 찾는 즉시 반환합니다.
+    
+    soundfile.blocks로 겹침(overlap)이 있는 블록을 읽고, 블록 경계에서 겹침의 절반씩만
+    판정에 사용하므로 같은 프레임이 두 번 처리되지 않습니다. 메모리 사용량은 녹음 길이와
+    무관하게 블록 크기에 비례합니다.
+    
+    Args:
+        file_path (str): 오디오 파일 경로
+        block_duration (float): 블록 길이 (초)
+        overlap_duration (float): 인접 블록 간 겹침 길이 (초)
+        n_mels (int): Mel 필터뱅크 개수
+        hop_length (int): 프레임 간격 (샘플)
+        energy_threshold (float): 정규화된 에너지 임계값
+        min_duration (float): 최소 음소 지속 시간 (초)
+        normalizer (RunningEnergyNormalizer, optional): 정규화 통계. None이면 새로 생성
+    
+    Yields:
+        tuple: (시작 시간, 종료 시간, 음소 타입)
+    """
+    info = sf.info(file_path)
+    sr = info.samplerate
+    block_size = int(block_duration * sr)
+    overlap = int(overlap_duration * sr)
+    if overlap >= block_size:
+        raise ValueError("overlap_duration은 block_duration보다 작아야 합니다.")
+    step = block_size - overlap
+    if normalizer is None:
+        normalizer = RunningEnergyNormalizer()
+    
+    current_start = None
+    current_end = None
+    current_type = None
+    pending = None  # 다음 구간과 병합될 수 있는 마지막 구간
+    
+    def emit(segment):
+        # 같은 타입의 짧은 간격은 병합하고, 확정된 구간만 반환
+        nonlocal pending
+        if pending is not None and segment[2] == pending[2] and segment[0] - pending[1] < min_duration:
+            pending = (pending[0], segment[1], pending[2])
+            return None
+        done, pending = pending, segment
+        return done
+    
+    for block_index, block in enumerate(sf.blocks(file_path, blocksize=block_size,
+                                                  overlap=overlap, dtype='float32')):
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        block_offset = block_index * step / sr
+        is_last = block_index * step + len(block) >= info.frames
+        
+        mel_spec = librosa.feature.melspectrogram(y=block, sr=sr, n_mels=n_mels,
+                                                  hop_length=hop_length)
+        energy = np.mean(librosa.power_to_db(mel_spec, ref=1.0), axis=0)
+        normalizer.update(energy)
+        energy = normalizer.normalize(energy)
+        frame_times = librosa.frames_to_time(np.arange(len(energy)), sr=sr,
+                                             hop_length=hop_length)
+        
+        # 블록 경계의 겹침 구간은 절반씩 나누어 담당
+        valid_from = overlap / sr / 2 if block_index > 0 else 0.0
+        valid_to = np.inf if is_last else (len(block) - overlap / 2) / sr
+        valid = (frame_times >= valid_from) & (frame_times < valid_to)
+        voiced = _formant_voiced_mask(block, sr, frame_times)
+        
+        for i in np.flatnonzero(valid):
+            t = block_offset + frame_times[i]
+            if energy[i] > energy_threshold:
+                if current_start is None:
+                    current_start = t
+                    current_type = 'vowel' if voiced[i] else 'consonant'
+                current_end = t
+            elif current_start is not None:
+                if current_end - current_start >= min_duration:
+                    done = emit((current_start, current_end, current_type))
+                    if done is not None:
+                        yield done
+                current_start = None
+                current_end = None
+                current_type = None
+    
+    if current_start is not None and current_end - current_start >= min_duration:
+        done = emit((current_start, current_end, current_type))
+        if done is not None:
+            yield done
+    if pending is not None:
+        yield pending
+
 def main():
     # 파일 경로 설정
     file_path = "../../../Desktop/results/participant_9999_20250331_0909/9999_stage3_20250331_0911.wav"
@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import parselmouth
+from tqdm import tqdm
+
+def find_silence_runs(values, times, threshold_db=-50, min_silence_duration=0.05):
+    """
+    intensity 값이 threshold_db 미만으로 연속되는 구간을 배열 연산으로 찾습니다.
+
+    구간 길이는 첫 프레임과 마지막 프레임 시각의 차이로 계산합니다.
+    (기존 analysis.ipynb의 프레임 루프 구현과 동일한 정의)
+
+    Args:
+        values (np.ndarray): 프레임별 intensity (dB)
+        times (np.ndarray): 프레임 시각 (초)
+        threshold_db (float): 무음 판정 임계값 (dB)
+        min_silence_duration (float): 최소 무음 지속 시간 (초)
+
+    Returns:
+        tuple: (starts, ends) 무음 구간의 첫/마지막 프레임 시각 배열
+    """
+    values = np.asarray(values)
+    times = np.asarray(times)
+    low_mask = values < threshold_db
+
+    # 마스크 앞뒤에 False를 붙여 diff로 구간 시작(+1)과 끝(-1)을 찾음
+    edges = np.diff(np.concatenate(([0], low_mask.astype(np.int8), [0])))
+    start_idx = np.flatnonzero(edges == 1)
+    end_idx = np.flatnonzero(edges == -1) - 1
+
+    starts = times[start_idx]
+    ends = times[end_idx]
+    keep = (ends - starts) >= min_silence_duration
+    return starts[keep], ends[keep]
+
+def detect_syllable_boundaries(sound, threshold_db=-50, min_silence_duration=0.05):
+    """
+    음성(sound)에서 intensity(< threshold_db dB) 구간이 min_silence_duration 이상 연속되는
+    지점을 무음(silence) 경계로 검출하여, 경계(무음 구간 중점) 배열을 반환합니다.
+
+    Args:
+        sound (parselmouth.Sound | str): Praat Sound 객체 또는 오디오 파일 경로
+        threshold_db (float): 무음 판정 임계값 (dB)
+        min_silence_duration (float): 최소 무음 지속 시간 (초)
+
+    Returns:
+        np.ndarray: 경계 시각 배열 (초)
+    """
+    if isinstance(sound, (str, os.PathLike)):
+        sound = parselmouth.Sound(str(sound))
+    intensity = sound.to_intensity()
+    starts, ends = find_silence_runs(intensity.values[0], intensity.xs(),
+                                     threshold_db, min_silence_duration)
+    return (starts + ends) / 2
+
+def _detect_file(args):
+    file_path, threshold_db, min_silence_duration = args
+    return file_path, detect_syllable_boundaries(file_path, threshold_db, min_silence_duration)
+
+def detect_syllable_boundaries_batch(file_paths, threshold_db=-50, min_silence_duration=0.05,
+                                     n_workers=None):
+    """
+    여러 오디오 파일(토큰 또는 단계 녹음)에 대해 경계를 병렬로 검출합니다.
+
+    Args:
+        file_paths (list): 오디오 파일 경로 리스트
+        threshold_db (float): 무음 판정 임계값 (dB)
+        min_silence_duration (float): 최소 무음 지속 시간 (초)
+        n_workers (int, optional): 프로세스 개수. 1이면 현재 프로세스에서 순차 처리
+
+    Returns:
+        dict: {파일 경로: 경계 시각 배열}
+    """
+    tasks = [(path, threshold_db, min_silence_duration) for path in file_paths]
+
+    if n_workers == 1:
+        results = map(_detect_file, tasks)
+        return dict(tqdm(results, total=len(tasks), desc="경계 검출 중"))
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(_detect_file, tasks, chunksize=8)
+        return dict(tqdm(results, total=len(tasks), desc="경계 검출 중"))
+
+def save_boundaries(boundaries, output_path):
+    """
+    batch 결과를 하나의 npz 파일로 저장합니다. (키: 파일 이름)
+
+    Args:
+        boundaries (dict): detect_syllable_boundaries_batch 결과
+        output_path (str): 저장할 .npz 경로
+    """
+    np.savez_compressed(output_path, **{os.path.basename(path): values
+                                        for path, values in boundaries.items()})
+
+if __name__ == "__main__":
+    directory_path = "../../../../Desktop/results"
+    wav_files = [os.path.join(root, f)
+                 for root, _, files in os.walk(directory_path)
+                 for f in files if f.endswith('.wav')]
+    boundaries = detect_syllable_boundaries_batch(wav_files)
+    save_boundaries(boundaries, os.path.join(directory_path, 'syllable_boundaries.npz'))
+    print(f"총 {len(boundaries)}개 파일의 경계를 저장했습니다.")
@@ -0,0 +1,62 @@
+import numpy as np
+import soundfile as sf
+from token_detection import (estimate_recording_offset, match_islands_to_trials,
+                             check_stage_recording)
+
+SR = 16000
+TRUE_OFFSET = 2.0
+
+def _synthetic_trials(n_trials=10, seed=0):
+    """시행 창(제시 ~ 스페이스바)과 그 안의 발화 구간을 만듭니다. (첫 제시 기준, 초)"""
+    rng = np.random.default_rng(seed)
+    win_starts, win_ends, starts, ends = [], [], [], []
+    t = 0.0
+    for _ in range(n_trials):
+        length = rng.uniform(1.4, 2.2)
+        speech_start = t + rng.uniform(0.3, 0.5)
+        speech_end = speech_start + rng.uniform(0.4, 0.7)
+        win_starts.append(t)
+        win_ends.append(t + length)
+        starts.append(speech_start)
+        ends.append(speech_end)
+        t += length + 0.05
+    return tuple(np.array(v) for v in (win_starts, win_ends, starts, ends))
+
+def test_estimate_recording_offset_recovers_nonzero_offset():
+    win_starts, win_ends, starts, ends = _synthetic_trials()
+    offset = estimate_recording_offset(starts + TRUE_OFFSET, ends + TRUE_OFFSET, win_starts, win_ends)
+    assert abs(offset - TRUE_OFFSET) < 0.3
+
+    trials, extras = match_islands_to_trials(starts + TRUE_OFFSET - offset, ends + TRUE_OFFSET - offset,
+                                             win_starts, win_ends)
+    assert not trials['overlap'].any()
+    assert (trials['n_islands'] == 1).all()
+    assert len(extras) == 0
+
+def test_check_stage_recording_uses_marker_sidecar(tmp_path):
+    win_starts, win_ends, starts, ends = _synthetic_trials(n_trials=6)
+    win_starts, win_ends = win_starts + TRUE_OFFSET, win_ends + TRUE_OFFSET
+    starts, ends = starts + TRUE_OFFSET, ends + TRUE_OFFSET
+
+    rng = np.random.default_rng(1)
+    y = rng.normal(0, 1e-4, int((win_ends[-1] + 0.5) * SR)).astype(np.float32)
+    for s, e in zip(starts, ends):
+        y[int(s * SR):int(e * SR)] += rng.normal(0, 0.2, int(e * SR) - int(s * SR)).astype(np.float32)
+    wav_path = str(tmp_path / '1_stage1_20250101_1200.wav')
+    sf.write(wav_path, y, SR)
+
+    n = len(win_starts)
+    np.savez(wav_path.replace('.wav', '.markers.npz'),
+             sample=np.concatenate([np.round(win_starts * SR), np.round(win_ends * SR)]).astype(np.int64),
+             kind=np.array(['onset'] * n + ['space'] * n),
+             trial=np.tile(np.arange(1, n + 1), 2).astype(np.int32),
+             label=np.tile(np.array([f'단어{i}' for i in range(1, n + 1)]), 2),
+             samplerate=np.int64(SR))
+
+    # Excel 없이 마커 파일만으로 시행 창을 잡아야 함
+    trials, extras, offset = check_stage_recording(wav_path, str(tmp_path / 'missing.xlsx'), 1)
+    assert abs(offset - TRUE_OFFSET) < 1e-3
+    assert list(trials['단어']) == [f'단어{i}' for i in range(1, n + 1)]
+    assert not trials['missing'].any()
+    assert not trials['overlap'].any()
+    assert np.allclose(trials['speech_start'], starts, atol=0.05)
@@ -1,5 +1,6 @@
 import os
 from datetime import datetime
+import pandas as pd
 
 def calculate_time_difference(file1, file2):
     """
@@ -106,6 +107,84 @@ def analyze_datetime_differences(times):
     
     return time_diffs
 
+def calculate_numeric_differences(df, start_column, end_column):
+    """
+    숫자 시각 열(초) 간 차이를 밀리초로 계산합니다. (문자열 파싱 없음)
+    
+    Args:
+        df (pd.DataFrame): 단계 시트 데이터
+        start_column (str): 시작 시각 열 (예: '시작_단조시각')
+        end_column (str): 끝 시각 열 (예: '스페이스바_단조시각')
+    
+    Returns:
+        pd.Series: 시행별 차이 (ms). 두 열 중 하나가 비어 있으면 NaN
+    """
+    start = pd.to_numeric(df[start_column], errors='coerce')
+    end = pd.to_numeric(df[end_column], errors='coerce')
+    return (end - start) * 1000.0
+
+def analyze_trial_timing(excel_path):
+    """
+    실험 데이터 Excel의 단계 시트별로 시작~스페이스바 시간을 계산합니다.
+    
+    시행마다 같은 시계로 잰 두 시각만 뺍니다. 녹음 스트림 시계 열을 우선 쓰고, 없으면
+    단조 시계(perf_counter) 열, 그것도 없으면 '시작시간'/'스페이스바_시간' 문자열을 씁니다.
+    음성 자극 시행은 재생 스트림 시각을 녹음 스트림 시각으로 바꾼 오프셋
+    ('출력시계_오프셋_초')이 기록된 경우에만 숫자 열을 사용합니다. (그 전 파일은 시작
+    시각과 스페이스바 시각의 시계가 달라 문자열로 계산)
+    
+    Args:
+        excel_path (str): 참가자 실험 데이터 Excel 파일 경로
+    
+    Returns:
+        pd.DataFrame: 단계, 시행, 시작~스페이스바(ms), 기준 시계 열
+    """
+    results = []
+    with pd.ExcelFile(excel_path) as xls:
+        for sheet_name in xls.sheet_names:
+            if not sheet_name.startswith('Stage'):
+                continue
+            df = pd.read_excel(xls, sheet_name=sheet_name)
+            
+            # 음성 자극 시행은 시계 오프셋이 있어야 숫자 열끼리 뺄 수 있음
+            audio_trial = df['음성파일'].notna() if '음성파일' in df.columns else pd.Series(False, index=df.index)
+            has_offset = df['출력시계_오프셋_초'].notna() if '출력시계_오프셋_초' in df.columns \
+                else pd.Series(False, index=df.index)
+            numeric_ok = ~audio_trial | has_offset
+            
+            diffs = pd.Series(float('nan'), index=df.index)
+            clocks = pd.Series('', index=df.index)
+            for clock, start_column, end_column in (('스트림', '시작_스트림시각', '스페이스바_스트림시각'),
+                                                    ('단조', '시작_단조시각', '스페이스바_단조시각')):
+                if {start_column, end_column} <= set(df.columns):
+                    values = calculate_numeric_differences(df, start_column, end_column)
+                    fill = diffs.isna() & values.notna() & numeric_ok
+                    diffs[fill] = values[fill]
+                    clocks[fill] = clock
+            if {'시작시간', '스페이스바_시간'} <= set(df.columns):
+                for idx in diffs.index[diffs.isna()]:
+                    start, end = df.at[idx, '시작시간'], df.at[idx, '스페이스바_시간']
+                    if isinstance(start, str) and isinstance(end, str):
+                        diffs[idx] = calculate_datetime_difference(start, end).total_seconds() * 1000.0
+                        clocks[idx] = '문자열'
+            
+            results.append(pd.DataFrame({
+                '단계': sheet_name[5:],
+                '시행': range(1, len(df) + 1),
+                '시작_스페이스바_ms': diffs.round(3).values,
+                '기준시계': clocks.values
+            }))
+    
+    if not results:
+        return pd.DataFrame(columns=['단계', '시행', '시작_스페이스바_ms', '기준시계'])
+    result = pd.concat(results, ignore_index=True)
+    
+    # 결과 출력
+    print("\n시행 시간 분석 결과 (ms):")
+    print(result.groupby('단계')['시작_스페이스바_ms'].describe())
+    
+    return result
+
 def main():
     # 파일 경로 설정
     directory_path = "../../../../Desktop/results"
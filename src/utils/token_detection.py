@@ -0,0 +1,335 @@
+import os
+import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+import soundfile as sf
+from tqdm import tqdm
+
+WORD_STAGES = (1, 2, 6)
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+def frame_energy_db(file_path, frame_duration=0.02, frames_per_block=4096):
+    """
+    오디오 파일을 블록 단위로 읽으며 프레임별 RMS 에너지(dBFS)를 계산합니다.
+
+    Args:
+        file_path (str): 오디오 파일 경로
+        frame_duration (float): 프레임 길이 (초)
+        frames_per_block (int): 한 번에 읽을 프레임 수
+
+    Returns:
+        tuple: (energy_db, hop) 프레임별 에너지 배열과 프레임 간격 (초)
+    """
+    sr = sf.info(file_path).samplerate
+    frame_length = max(int(frame_duration * sr), 1)
+    energy = []
+
+    for block in sf.blocks(file_path, blocksize=frame_length * frames_per_block, dtype='float32'):
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        n_frames = len(block) // frame_length
+        if n_frames == 0:
+            continue
+        frames = block[:n_frames * frame_length].reshape(n_frames, frame_length)
+        energy.append(np.sqrt(np.mean(frames * frames, axis=1)))
+
+    energy = np.concatenate(energy) if energy else np.zeros(0, dtype=np.float32)
+    return 20 * np.log10(np.maximum(energy, 1e-10)), frame_length / sr
+
+def _runs(mask):
+    """bool 마스크에서 True 구간의 (시작 인덱스, 끝 인덱스+1) 배열을 반환합니다."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+def detect_speech_islands(energy_db, hop, threshold_db=None, floor_margin_db=15.0,
+                          min_speech=0.15, min_gap=0.2):
+    """
+    프레임 에너지에서 발화 구간(speech island)을 찾습니다.
+
+    Args:
+        energy_db (np.ndarray): 프레임별 에너지 (dBFS)
+        hop (float): 프레임 간격 (초)
+        threshold_db (float, optional): 발화 판정 임계값. None이면 잡음 바닥(10 백분위수)
+            + floor_margin_db를 사용
+        floor_margin_db (float): 잡음 바닥 대비 여유 (dB)
+        min_speech (float): 최소 발화 길이 (초)
+        min_gap (float): 이보다 짧은 무음은 앞뒤 발화와 합침 (초)
+
+    Returns:
+        tuple: (starts, ends) 발화 구간 시작/종료 시각 배열 (초)
+    """
+    if len(energy_db) == 0:
+        return np.zeros(0), np.zeros(0)
+    if threshold_db is None:
+        threshold_db = np.percentile(energy_db, 10) + floor_margin_db
+    mask = energy_db > threshold_db
+
+    # 짧은 무음 메우기
+    gap_starts, gap_ends = _runs(~mask)
+    short = (gap_ends - gap_starts) * hop < min_gap
+    inner = (gap_starts > 0) & (gap_ends < len(mask))
+    for s, e in zip(gap_starts[short & inner], gap_ends[short & inner]):
+        mask[s:e] = True
+
+    starts, ends = _runs(mask)
+    keep = (ends - starts) * hop >= min_speech
+    return starts[keep] * hop, ends[keep] * hop
+
+def load_trial_windows(excel_path, stage):
+    """
+    실험 Excel의 Stage 시트에서 시행별 시간 창(제시 ~ 스페이스바)을 읽습니다.
+
+    Args:
+        excel_path (str): {참가자번호}_experiment_data.xlsx 경로
+        stage (int): 단계 번호
+
+    Returns:
+        pd.DataFrame: 단어, onset, offset (첫 시행 제시 시각 기준, 초)
+    """
+    df = pd.read_excel(excel_path, sheet_name=f'Stage{stage}')
+    onset = pd.to_datetime(df['시작시간'], format=TIME_FORMAT)
+    offset = pd.to_datetime(df['스페이스바_시간'], format=TIME_FORMAT)
+    origin = onset.iloc[0]
+    label_col = '단어' if '단어' in df.columns else '음성파일'
+    return pd.DataFrame({
+        '단어': df[label_col].to_numpy(),
+        'onset': (onset - origin).dt.total_seconds().to_numpy(),
+        'offset': (offset - origin).dt.total_seconds().to_numpy(),
+    })
+
+def estimate_recording_offset(starts, ends, win_starts, win_ends, max_offset=60.0, step=0.01):
+    """
+    녹음 시작부터 첫 시행 제시까지의 지연을 추정합니다.
+
+    Excel 시각은 벽시계 기준이고 녹음 파일에는 표지가 없으므로, 발화 구간의 중점이
+    시행 창 안에 가장 많이 들어가는 오프셋을 격자 탐색으로 찾습니다. 같은 점수의
+    오프셋은 보통 넓은 구간(plateau)을 이루므로 첫 값이 아니라, 발화 전체가 창 안에
+    들어가는 개수로 한 번 더 좁힌 뒤 가장 긴 구간의 가운데를 고릅니다.
+
+    Returns:
+        float: 추정 오프셋 (초)
+    """
+    if len(starts) == 0:
+        return 0.0
+    mids = (starts + ends) / 2
+    offsets = np.arange(0.0, max_offset, step)
+    shifted = mids[None, :] - offsets[:, None]
+    idx = np.searchsorted(win_starts, shifted, side='right') - 1
+    clipped = np.clip(idx, 0, None)
+    inside = (idx >= 0) & (shifted < win_ends[clipped])
+    # 발화 시작/종료까지 같은 창 안에 들어가는지
+    contained = inside & (starts[None, :] - offsets[:, None] >= win_starts[clipped]) & \
+        (ends[None, :] - offsets[:, None] <= win_ends[clipped])
+
+    score = inside.sum(axis=1)
+    best = score == score.max()
+    tie_break = np.where(best, contained.sum(axis=1), -1)
+    best = tie_break == tie_break.max()
+
+    run_starts, run_ends = _runs(best)
+    longest = np.argmax(run_ends - run_starts)
+    center = (run_starts[longest] + run_ends[longest] - 1) / 2
+    return float(center * step)
+
+def match_islands_to_trials(starts, ends, win_starts, win_ends, tolerance=0.1):
+    """
+    발화 구간을 시행 창에 대응시키고 누락/반복/경계 침범/추가 발화를 표시합니다.
+
+    Args:
+        starts, ends (np.ndarray): 발화 구간 (초, 시행 시각 기준으로 정렬된 상태)
+        win_starts, win_ends (np.ndarray): 시행 창 (초)
+        tolerance (float): 창 경계 허용 오차 (초)
+
+    Returns:
+        tuple: (trials, extras) 시행별 판정 DataFrame과 창 밖 발화 구간 DataFrame
+    """
+    mids = (starts + ends) / 2
+    idx = np.searchsorted(win_starts, mids, side='right') - 1
+    inside = (idx >= 0) & (mids < win_ends[np.clip(idx, 0, None)])
+
+    n_trials = len(win_starts)
+    counts = np.bincount(idx[inside], minlength=n_trials)
+    crosses = inside & ((starts < win_starts[np.clip(idx, 0, None)] - tolerance) |
+                        (ends > win_ends[np.clip(idx, 0, None)] + tolerance))
+    overlap = np.bincount(idx[crosses], minlength=n_trials) > 0
+
+    first = np.full(n_trials, np.nan)
+    last = np.full(n_trials, np.nan)
+    order = np.flatnonzero(inside)
+    # 창마다 첫 발화 시작과 마지막 발화 종료
+    np.fmin.at(first, idx[order], starts[order])
+    np.fmax.at(last, idx[order], ends[order])
+
+    trials = pd.DataFrame({
+        'n_islands': counts,
+        'speech_start': first,
+        'speech_end': last,
+        'missing': counts == 0,
+        'repeated': counts > 1,
+        'overlap': overlap,
+    })
+    extras = pd.DataFrame({'start': starts[~inside], 'end': ends[~inside]})
+    return trials, extras
+
+def marker_path(wav_path):
+    """녹음과 함께 저장된 마커 파일 경로"""
+    return wav_path.replace('.wav', '.markers.npz')
+
+def marker_trial_windows(wav_path):
+    """
+    마커 파일에서 시행별 시간 창(제시 ~ 스페이스바)을 녹음 시작 기준 초로 읽습니다.
+
+    스페이스바 마커가 없는 시행은 다음 시행 제시(마지막 시행은 녹음 끝)까지로 봅니다.
+
+    Returns:
+        pd.DataFrame: 단어, onset, offset (녹음 시작 기준, 초)
+    """
+    info = sf.info(wav_path)
+    markers = load_trial_markers(wav_path).sort_values('trial')
+    onset = markers['onset'].to_numpy(dtype=np.float64)
+    space = markers['space'].to_numpy(dtype=np.float64)
+    following = np.append(onset[1:], info.frames)
+    space = np.where(space >= 0, space, following)
+    return pd.DataFrame({
+        '단어': markers['label'].to_numpy(),
+        'onset': onset / info.samplerate,
+        'offset': space / info.samplerate,
+    })
+
+def check_stage_recording(wav_path, excel_path, stage, offset=None, **vad_kwargs):
+    """
+    단계 녹음 하나를 시행 타이밍과 대조합니다.
+
+    녹음 옆에 마커 파일(.markers.npz)이 있으면 그 샘플 위치로 시행 창을 잡고,
+    없는 예전 녹음만 Excel 시각과 오프셋 추정을 사용합니다.
+
+    Args:
+        wav_path (str): 단계 녹음 파일 경로
+        excel_path (str): 실험 Excel 경로
+        stage (int): 단계 번호
+        offset (float, optional): 녹음 시작 ~ 첫 시행 제시 지연 (초). None이면 추정
+            (마커 파일이 있으면 무시)
+        **vad_kwargs: detect_speech_islands 인자
+
+    Returns:
+        tuple: (trials, extras, offset)
+    """
+    energy_db, hop = frame_energy_db(wav_path)
+    starts, ends = detect_speech_islands(energy_db, hop, **vad_kwargs)
+
+    if os.path.exists(marker_path(wav_path)):
+        # 마커는 이미 녹음 기준이므로 첫 시행 제시 시각이 곧 오프셋
+        windows = marker_trial_windows(wav_path)
+        offset = float(windows['onset'].iloc[0]) if len(windows) else 0.0
+        windows['onset'] -= offset
+        windows['offset'] -= offset
+    else:
+        windows = load_trial_windows(excel_path, stage)
+
+    win_starts = windows['onset'].to_numpy()
+    win_ends = windows['offset'].to_numpy()
+    if offset is None:
+        offset = estimate_recording_offset(starts, ends, win_starts, win_ends)
+
+    trials, extras = match_islands_to_trials(starts - offset, ends - offset, win_starts, win_ends)
+    trials.insert(0, '단어', windows['단어'].to_numpy())
+    trials.insert(1, 'onset', win_starts + offset)
+    trials.insert(2, 'offset', win_ends + offset)
+    for col in ('speech_start', 'speech_end'):
+        trials[col] += offset
+    extras += offset
+    return trials, extras, offset
+
+def load_trial_markers(wav_path):
+    """
+    녹음과 함께 저장된 마커 파일({녹음 이름}.markers.npz)을 시행별 표로 읽습니다.
+
+    마커는 녹음 파일 기준 샘플 위치이므로 정렬 없이 바로 시행 구간을 자를 수 있습니다.
+    (예: y[row.onset:row.space])
+
+    Args:
+        wav_path (str): 단계 녹음 파일 경로
+
+    Returns:
+        pd.DataFrame: trial, label, onset, stimulus_end, space (샘플 위치, 없으면 -1)
+    """
+    data = np.load(marker_path(wav_path))
+    markers = pd.DataFrame({
+        'trial': data['trial'],
+        'label': data['label'],
+        'kind': data['kind'],
+        'sample': data['sample'],
+    })
+    table = markers.pivot_table(index=['trial', 'label'], columns='kind', values='sample', aggfunc='first')
+    table = table.reindex(columns=['onset', 'stimulus_end', 'space']).fillna(-1).astype(np.int64)
+    table.columns.name = None
+    return table.reset_index()
+
+def _find_stage_jobs(results_dir, stages):
+    jobs = []
+    for folder in sorted(glob.glob(os.path.join(results_dir, 'participant_*'))):
+        excel_files = glob.glob(os.path.join(folder, '*_experiment_data.xlsx'))
+        if not excel_files:
+            continue
+        for stage in stages:
+            for wav_path in sorted(glob.glob(os.path.join(folder, f'*_stage{stage}_*.wav'))):
+                jobs.append((wav_path, excel_files[0], stage))
+    return jobs
+
+def _check_job(job):
+    wav_path, excel_path, stage = job
+    trials, extras, offset = check_stage_recording(wav_path, excel_path, stage)
+    trials.to_csv(wav_path.replace('.wav', '_token_check.csv'), index=False, encoding='utf-8-sig')
+    return {
+        '파일': os.path.basename(wav_path),
+        '단계': stage,
+        '시행수': len(trials),
+        '누락': int(trials['missing'].sum()),
+        '반복': int(trials['repeated'].sum()),
+        '경계침범': int(trials['overlap'].sum()),
+        '추가발화': len(extras),
+        '오프셋(초)': round(offset, 3),
+    }
+
+def check_cohort(results_dir, stages=WORD_STAGES, n_workers=None):
+    """
+    전체 참가자의 단어 읽기 단계 녹음을 일괄 점검합니다. (MFA 정렬 전 사전 점검)
+
+    각 녹음 옆에 _token_check.csv를 저장하고, 요약을 token_check_summary.csv로 저장합니다.
+
+    Args:
+        results_dir (str): participant_* 폴더들이 있는 결과 디렉토리
+        stages (tuple): 점검할 단계
+        n_workers (int, optional): 프로세스 개수
+
+    Returns:
+        pd.DataFrame: 녹음별 요약
+    """
+    jobs = _find_stage_jobs(results_dir, stages)
+    print(f"총 {len(jobs)}개의 단계 녹음을 점검합니다.")
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = {executor.submit(_check_job, job): job for job in jobs}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="녹음 점검 중"):
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                print(f"\nError checking {os.path.basename(futures[future][0])}: {e}")
+
+    summary = pd.DataFrame(rows)
+    if not summary.empty:
+        summary = summary.sort_values(['파일', '단계'], ignore_index=True)
+    summary.to_csv(os.path.join(results_dir, 'token_check_summary.csv'),
+                   index=False, encoding='utf-8-sig')
+    return summary
+
+if __name__ == "__main__":
+    results_dir = "../../../../Desktop/results"
+    summary = check_cohort(results_dir)
+    flagged = summary[(summary['누락'] > 0) | (summary['반복'] > 0) | (summary['추가발화'] > 0)] \
+        if not summary.empty else summary
+    print(f"\n문제가 있는 녹음: {len(flagged)}개")
+    if not flagged.empty:
+        print(flagged.to_string(index=False))